@@ -1,13 +1,17 @@
+import math
+
 import numpy as np
-import matplotlib.pyplot as plt
 import streamlit as st
 
-import base64
+from assets import get_image_base64
+from figure_cache import cached_png
+from perf import RerunTimer
+from phasor_plots import plot_three_phase_vectors, plot_three_phase_waveforms
+from phase_cache import cached_phase, clear_shown_phases, phase_input_error, phase_input_status
+from quadrants import get_quadrant
+from shared_cache import memoize
 
-def get_image_base64(file_path):
-    with open(file_path, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+rerun_timer = RerunTimer()
 
 logo_base64 = get_image_base64("tata_logo.png")
 
@@ -31,115 +35,75 @@ st.markdown(
 )
 # --- Helper functions ---
 # --- Helper functions ---
-def get_quadrant(angle_deg):
-    if 0 <= angle_deg <= 90:
-        return "Quadrant I (Inductive Load)"
-    elif 90 < angle_deg <= 180:
-        return "Quadrant II (Generator - Leading)"
-    elif -180 <= angle_deg < -90:
-        return "Quadrant III (Generator - Lagging)"
-    elif -90 <= angle_deg < 0:
-        return "Quadrant IV (Capacitive Load)"
-    else:
-        return "Unknown"
-
-def plot_vectors(Vrms_list, Irms_list, current_angles_deg):
-    fig, ax = plt.subplots(figsize=(8,8))
-    
-    voltage_angles_deg = [0, -120, 120]  # Fixed voltage angles
-    colors = ['red', 'gold', 'blue']
-    labels = ['Phase R', 'Phase Y', 'Phase B']
-
-    # Plot voltage vectors (solid line arrows)
-    for i in range(3):
-        Vx = Vrms_list[i] * np.cos(np.radians(voltage_angles_deg[i]))
-        Vy = Vrms_list[i] * np.sin(np.radians(voltage_angles_deg[i]))
-        ax.arrow(0, 0, Vx, Vy, head_width=15, head_length=15, fc=colors[i], ec=colors[i], label=f'Voltage {labels[i]}')
-
-    # Plot current vectors (dashed line simulation)
-    for i in range(3):
-        angle = voltage_angles_deg[i] - current_angles_deg[i]
-        Ix = Irms_list[i] * np.cos(np.radians(angle))
-        Iy = Irms_list[i] * np.sin(np.radians(angle))
-        # Dashed current arrow
-        ax.plot([0, Ix], [0, Iy], color=colors[i], linestyle='dashed', label=f'Current {labels[i]}')
-
-    ax.set_xlim(-300, 300)
-    ax.set_ylim(-300, 300)
-    ax.set_aspect('equal')
-    ax.grid(True)
-    ax.legend()
-    ax.set_title('Voltage and Current Vectors')
-    st.pyplot(fig)
-
-def plot_waveforms(Vrms_list, Irms_list, current_angles_deg, time_vector):
-    omega = 2 * np.pi * 50  # 50Hz
-    voltage_angles_deg = [0, -120, 120]  # Voltage fixed
-    
-    colors = ['red', 'gold', 'blue']
-    labels = ['R', 'Y', 'B']
-    
-    fig, ax = plt.subplots(figsize=(10,6))
-
-    for i in range(3):
-        Vpeak = Vrms_list[i] * np.sqrt(2)
-        Ipeak = Irms_list[i] * np.sqrt(2)
-        
-        v_wave = Vpeak * np.sin(omega * time_vector + np.radians(voltage_angles_deg[i]))
-        i_wave = Ipeak * np.sin(omega * time_vector + np.radians(voltage_angles_deg[i] - current_angles_deg[i]))
-        
-        ax.plot(time_vector, v_wave, color=colors[i], label=f'V{labels[i]}', linestyle='solid')
-        ax.plot(time_vector, i_wave, color=colors[i], label=f'I{labels[i]}', linestyle='dashed')
-
-    ax.set_xlabel('Time (s)')
-    ax.set_ylabel('Amplitude')
-    ax.set_title('Voltage and Current Waveforms')
-    ax.grid(True)
-    ax.legend()
-    st.pyplot(fig)
+# Shared by every session, so users on the same inputs compute them once
+@memoize('app333_phase')
+def compute_phase(V, I, angle_deg):
+    angle_rad = np.radians(angle_deg)
+    return {
+        'P': V * I * np.cos(angle_rad),
+        'Q': V * I * np.sin(angle_rad),
+        'S': V * I,
+        'quadrant': get_quadrant(angle_deg),
+    }
 
 # --- Streamlit UI ---
 
 
 st.subheader("Enter RMS Values and Angles:")
 
-Vrms_R = st.number_input("Phase R Voltage (RMS) [V]", value=230.0)
-Vrms_Y = st.number_input("Phase Y Voltage (RMS) [V]", value=230.0)
-Vrms_B = st.number_input("Phase B Voltage (RMS) [V]", value=230.0)
+# Inputs rerun as a fragment, so editing them never re-runs the plotting code
+@st.fragment
+def phase_inputs():
+    st.number_input("Phase R Voltage (RMS) [V]", value=230.0, key="Vrms_R")
+    st.number_input("Phase Y Voltage (RMS) [V]", value=230.0, key="Vrms_Y")
+    st.number_input("Phase B Voltage (RMS) [V]", value=230.0, key="Vrms_B")
 
-Irms_R = st.number_input("Phase R Current (RMS) [A]", value=100.0)
-Irms_Y = st.number_input("Phase Y Current (RMS) [A]", value=100.0)
-Irms_B = st.number_input("Phase B Current (RMS) [A]", value=100.0)
+    st.number_input("Phase R Current (RMS) [A]", value=100.0, key="Irms_R")
+    st.number_input("Phase Y Current (RMS) [A]", value=100.0, key="Irms_Y")
+    st.number_input("Phase B Current (RMS) [A]", value=100.0, key="Irms_B")
 
-angle_R = st.slider("Phase R Current Angle w.r.t Voltage (°)", -180, 180, 0)
-angle_Y = st.slider("Phase Y Current Angle w.r.t Voltage (°)", -180, 180, 0)
-angle_B = st.slider("Phase B Current Angle w.r.t Voltage (°)", -180, 180, 0)
+    st.slider("Phase R Current Angle w.r.t Voltage (°)", -180, 180, 0, key="angle_R")
+    st.slider("Phase Y Current Angle w.r.t Voltage (°)", -180, 180, 0, key="angle_Y")
+    st.slider("Phase B Current Angle w.r.t Voltage (°)", -180, 180, 0, key="angle_B")
+
+    for p in ['R', 'Y', 'B']:
+        phase_input_status(p, (st.session_state[f"Vrms_{p}"], st.session_state[f"Irms_{p}"],
+                               st.session_state[f"angle_{p}"]))
+
+clear_shown_phases()
+phase_inputs()
 
 time_interval = st.number_input("Time Interval (hours)", min_value=0.01, value=1.0)
+input_errors = [p for p in ['R', 'Y', 'B'] if phase_input_error(st.session_state[f"Vrms_{p}"], st.session_state[f"Irms_{p}"])]
 
-if st.button("Calculate and Plot"):
-    Vrms_list = [Vrms_R, Vrms_Y, Vrms_B]
-    Irms_list = [Irms_R, Irms_Y, Irms_B]
-    current_angles_deg = [angle_R, angle_Y, angle_B]
-    current_angles_rad = np.radians(current_angles_deg)
-    
-    # --- Power Calculations ---
-    P_list = [Vrms_list[i] * Irms_list[i] * np.cos(current_angles_rad[i]) for i in range(3)]  # Active Power (W)
-    Q_list = [Vrms_list[i] * Irms_list[i] * np.sin(current_angles_rad[i]) for i in range(3)]  # Reactive Power (VAR)
-    S_list = [Vrms_list[i] * Irms_list[i] for i in range(3)]                                # Apparent Power (VA)
-
-    P_total = sum(P_list)
-    Q_total = sum(Q_list)
-    S_total = sum(S_list)
+if st.button("Calculate and Plot") and not input_errors:
+    phase_names = ['R', 'Y', 'B']
+    Vrms_list = [st.session_state[f"Vrms_{p}"] for p in phase_names]
+    Irms_list = [st.session_state[f"Irms_{p}"] for p in phase_names]
+    current_angles_deg = [st.session_state[f"angle_{p}"] for p in phase_names]
+
+    # --- Power Calculations (only phases whose V/I/angle changed) ---
+    phase_results = [
+        cached_phase(p, (Vrms_list[i], Irms_list[i], current_angles_deg[i]),
+                     lambda: compute_phase(Vrms_list[i], Irms_list[i], current_angles_deg[i]))
+        for i, p in enumerate(phase_names)
+    ]
+    P_list = [r['P'] for r in phase_results]  # Active Power (W)
+    Q_list = [r['Q'] for r in phase_results]  # Reactive Power (VAR)
+    S_list = [r['S'] for r in phase_results]  # Apparent Power (VA)
+
+    P_total = math.fsum(P_list)
+    Q_total = math.fsum(Q_list)
+    S_total = math.fsum(S_list)
 
     # --- Energy Calculations ---
     kWh_list = [(P * time_interval) / 1000 for P in P_list]
     kVARh_list = [(Q * time_interval) / 1000 for Q in Q_list]
     kVAh_list = [(S * time_interval) / 1000 for S in S_list]
 
-    kWh_total = sum(kWh_list)
-    kVARh_total = sum(kVARh_list)
-    kVAh_total = sum(kVAh_list)
+    kWh_total = math.fsum(kWh_list)
+    kVARh_total = math.fsum(kVARh_list)
+    kVAh_total = math.fsum(kVAh_list)
 
     st.subheader("Results:")
     st.markdown(f"### Total Powers")
@@ -153,7 +117,6 @@ if st.button("Calculate and Plot"):
     st.write(f"**Total kVAh:** {kVAh_total:.2f}")
 
     st.markdown("### Individual Phase Details")
-    phase_names = ['R', 'Y', 'B']
     for i in range(3):
         st.write(f"**Phase {phase_names[i]}:**")
         st.write(f"  - Active Power (kW): {P_list[i]/1000:.2f}")
@@ -161,10 +124,13 @@ if st.button("Calculate and Plot"):
         st.write(f"  - Apparent Power (kVA): {S_list[i]/1000:.2f}")
         st.write(f"  - Energy kWh: {kWh_list[i]:.2f}, kVARh: {kVARh_list[i]:.2f}, kVAh: {kVAh_list[i]:.2f}")
 
-        quadrant = get_quadrant(current_angles_deg[i])
-        st.write(f"  - Power Quadrant: {quadrant}")
+        st.write(f"  - Power Quadrant: {phase_results[i]['quadrant']}")
 
     # --- Plots ---
     time_vector = np.linspace(0, 0.04, 1000)  # 2 cycles of 50Hz
-    plot_vectors(Vrms_list, Irms_list, current_angles_deg)
-    plot_waveforms(Vrms_list, Irms_list, current_angles_deg, time_vector)
+    st.image(cached_png('three_phase_vectors', lambda: plot_three_phase_vectors(Vrms_list, Irms_list, current_angles_deg),
+                        Vrms_list, Irms_list, current_angles_deg), width='stretch')
+    st.image(cached_png('three_phase_waveforms', lambda: plot_three_phase_waveforms(Vrms_list, Irms_list, current_angles_deg, time_vector),
+                        Vrms_list, Irms_list, current_angles_deg, time_vector), width='stretch')
+
+rerun_timer.report()
@@ -1,49 +1,16 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-from io import BytesIO
-import pandas as pd
 
-st.set_page_config(page_title="Three-Phase Analyzer", layout="centered")
-
-def plot_combined_three_phase_vectors(v_dict, i_dict, angles_dict):
-    fig, ax = plt.subplots()
-    colors = {'R': 'red', 'Y': 'green', 'B': 'blue'}
-
-    for phase in ['R', 'Y', 'B']:
-        angle_rad = np.radians(angles_dict[phase])
-        Vx = v_dict[phase] * np.cos(0)
-        Vy = v_dict[phase] * np.sin(0)
-        Ix = i_dict[phase] * np.cos(angle_rad)
-        Iy = i_dict[phase] * np.sin(angle_rad)
+from figure_cache import cached_png
+from perf import RerunTimer, stage
+from shared_cache import memoize
+from three_phase_report import energy_report, plot_combined_three_phase_vectors
 
-        ax.quiver(0, 0, Vx, Vy, angles='xy', scale_units='xy', scale=1,
-                  color=colors[phase], width=0.01, label=f'{phase} Voltage')
-        ax.quiver(0, 0, Ix, Iy, angles='xy', scale_units='xy', scale=1,
-                  color=colors[phase], alpha=0.5, width=0.005, label=f'{phase} Current')
+rerun_timer = RerunTimer()
 
-    max_val = max(max(v_dict.values()), max(i_dict.values())) + 50
-    ax.set_xlim(-max_val, max_val)
-    ax.set_ylim(-max_val, max_val)
-    ax.set_aspect('equal')
-    ax.grid(True)
-    ax.legend()
-    ax.set_title("Three-Phase Voltage and Current Vectors")
-    return fig
+# Shared by every session; each caller gets its own copy of the report frame
+shared_energy_report = memoize('energy_report')(energy_report)
 
-def calculate_power_energy(V, I, angle_deg, hours):
-    angle_rad = np.radians(angle_deg)
-    P = V * I * np.cos(angle_rad)
-    Q = V * I * np.sin(angle_rad)
-    S = V * I
-    return {
-        'kW': round(P / 1000, 3),
-        'kVAR': round(Q / 1000, 3),
-        'kVA': round(S / 1000, 3),
-        'kWh': round(P * hours / 1000, 3),
-        'kVARh': round(Q * hours / 1000, 3),
-        'kVAh': round(S * hours / 1000, 3)
-    }
+st.set_page_config(page_title="Three-Phase Analyzer", layout="centered")
 
 st.title("🔌 Three-Phase Voltage, Current, Power & Energy Analyzer")
 
@@ -60,23 +27,19 @@ for phase in phases:
 hours = st.number_input("Time Interval (in hours)", min_value=0.01, value=1.0, step=0.01)
 
 if st.button("Generate Report"):
-    fig = plot_combined_three_phase_vectors(v_dict, i_dict, angle_dict)
-    st.pyplot(fig)
+    png = cached_png('combined_vectors', lambda: plot_combined_three_phase_vectors(v_dict, i_dict, angle_dict),
+                     v_dict, i_dict, angle_dict)
+    st.image(png, width='stretch')
 
-    buf = BytesIO()
-    fig.savefig(buf, format="png")
-    buf.seek(0)
-    st.download_button("Download Vector Diagram", data=buf, file_name="three_phase_vector_diagram.png", mime="image/png")
+    st.download_button("Download Vector Diagram", data=png, file_name="three_phase_vector_diagram.png", mime="image/png")
 
     st.subheader("📊 Power and Energy Calculations")
-    data = []
-    for phase in phases:
-        result = calculate_power_energy(v_dict[phase], i_dict[phase], angle_dict[phase], hours)
-        result['Phase'] = phase
-        data.append(result)
-
-    df = pd.DataFrame(data)[['Phase', 'kW', 'kVAR', 'kVA', 'kWh', 'kVARh', 'kVAh']]
-    st.dataframe(df, use_container_width=True)
+    with stage('compute'):
+        df = shared_energy_report(v_dict, i_dict, angle_dict, hours)
+    st.dataframe(df, width='stretch')
 
-    csv = df.to_csv(index=False).encode()
+    with stage('csv'):
+        csv = df.to_csv(index=False).encode()
     st.download_button("Download Report (CSV)", data=csv, file_name="three_phase_energy_report.csv", mime="text/csv")
+
+rerun_timer.report()
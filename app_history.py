@@ -0,0 +1,44 @@
+import datetime
+import os
+
+import streamlit as st
+
+from perf import RerunTimer, stage
+from result_store import ResultStore
+
+rerun_timer = RerunTimer()
+
+st.set_page_config(page_title="Meter History", layout="wide")
+
+st.title("📈 Meter History from the Result Store")
+
+root = st.text_input("Result store folder", value=os.environ.get('ANALYZER_RESULT_STORE', 'result_store'))
+
+if not os.path.isdir(root):
+    st.caption("Fill a store with `python result_store.py ingest <store> <load-profile CSVs>` first.")
+else:
+    store = ResultStore(root)
+    days = store.days()
+    if not store.meters or not days:
+        st.info("The store is empty.")
+    else:
+        meter = st.selectbox("Meter", store.meters)
+        first, last = days[0].astype(datetime.date), days[-1].astype(datetime.date)
+        picked = st.date_input("Days", value=(max(first, last - datetime.timedelta(days=6)), last),
+                               min_value=first, max_value=last)
+        # While a range is being picked only its first day is set
+        start, end = (picked[0], picked[-1]) if isinstance(picked, (tuple, list)) else (picked, picked)
+
+        with stage('query'):
+            df = store.history(meter, start, end + datetime.timedelta(days=1))
+        st.caption(f"{len(df):,} rows for {meter}")
+
+        if len(df):
+            with stage('pivot'):
+                kw = df.pivot_table(index='timestamp', columns='phase', values='kW', aggfunc='sum')
+                totals = df.groupby('phase')[['kWh', 'kVARh', 'kVAh']].sum()
+                totals.loc['Total'] = totals.sum()
+            st.line_chart(kw)
+            st.dataframe(totals.round(3), width='stretch')
+
+rerun_timer.report()
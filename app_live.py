@@ -0,0 +1,95 @@
+import time
+
+import numpy as np
+import streamlit as st
+
+from live_polling import PHASES, LivePoller, parse_meters
+from perf import RerunTimer
+from quadrants import QUADRANT_LABELS
+
+rerun_timer = RerunTimer()
+
+st.set_page_config(page_title="Live Meter Monitor", layout="wide")
+
+
+# One poller thread per set of settings, shared by every session using them.
+# A few sets fit so operators with different settings do not keep evicting
+# each other; on_release stops an evicted or released thread and its sockets.
+@st.cache_resource(max_entries=4, on_release=lambda poller: poller.stop())
+def get_poller(meter_spec, interval, concurrency, timeout):
+    return LivePoller(parse_meters(meter_spec), interval, concurrency, timeout).start()
+
+# Snapshots older than this many poll intervals are flagged as stale
+STALE_INTERVALS = 3
+
+
+def snapshot_table(snapshot):
+    import pandas as pd
+
+    n = len(snapshot['meters'])
+    return pd.DataFrame({
+        'Meter': np.repeat(snapshot['meters'], len(PHASES)),
+        'Phase': PHASES * n,
+        'V': snapshot['V'].ravel(),
+        'I': snapshot['I'].ravel(),
+        'Angle (°)': snapshot['angle_deg'].ravel(),
+        'kW': snapshot['kW'].ravel(),
+        'kVAR': snapshot['kVAR'].ravel(),
+        'kVA': snapshot['kVA'].ravel(),
+        'Quadrant': np.array(QUADRANT_LABELS)[snapshot['quadrant'].ravel()],
+    })
+
+
+st.title("📡 Live Meter Monitor (Modbus TCP)")
+
+meter_spec = st.text_input("Meters (host:port[-port][:unit], comma separated)", value="127.0.0.1:15020-15119")
+interval = st.number_input("Poll interval (s)", min_value=0.2, value=1.0, step=0.1)
+concurrency = st.number_input("Max concurrent requests", min_value=1, value=100, step=10)
+timeout = st.number_input("Request timeout (s)", min_value=0.1, value=2.0, step=0.1)
+
+live = st.toggle("Start live polling")
+
+
+# Only this fragment reruns on the timer; the inputs above stay untouched
+@st.fragment(run_every=interval)
+def live_view(settings):
+    # Looked up on every tick, so a poller evicted or released by another
+    # session is replaced rather than read after it has stopped
+    poller = get_poller(*settings)
+    snapshot = poller.latest()
+    if snapshot is None:
+        st.info("Waiting for the first poll round…")
+        return
+
+    age = time.time() - snapshot['polled_at']
+    if not poller.running:
+        st.warning(f"Polling has stopped; showing the last round, from {age:.0f} s ago.")
+    elif age > STALE_INTERVALS * max(settings[1], snapshot['elapsed']):
+        st.warning(f"The last completed poll round is {age:.0f} s old; meters may be slow or unreachable.")
+
+    ok = len(snapshot['meters']) - len(snapshot['errors'])
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Meters responding", f"{ok}/{len(snapshot['meters'])}")
+    col2.metric("Total kW", f"{np.nansum(snapshot['kW']):.1f}")
+    col3.metric("Total kVAR", f"{np.nansum(snapshot['kVAR']):.1f}")
+    col4.metric("Poll round", f"{snapshot['elapsed'] * 1000:.0f} ms")
+
+    st.dataframe(snapshot_table(snapshot), width='stretch', hide_index=True)
+    if snapshot['errors']:
+        with st.expander(f"{len(snapshot['errors'])} meters not responding"):
+            st.write(snapshot['errors'])
+
+
+settings = (meter_spec, interval, int(concurrency), timeout)
+# Switching off, or to other settings, releases the poller this session used
+previous = st.session_state.get('live_settings')
+if previous is not None and (not live or previous != settings):
+    get_poller.clear(*previous)
+st.session_state['live_settings'] = settings if live else None
+
+if live:
+    live_view(settings)
+else:
+    st.caption("Run `python meter_simulator.py --count 100` to try this page without real meters.")
+
+rerun_timer.report()
@@ -0,0 +1,81 @@
+import streamlit as st
+
+from perf import RerunTimer, stage
+from sweep import grid, monte_carlo, plot_distributions, quadrant_shares, run_sweep, summarize
+
+rerun_timer = RerunTimer()
+
+st.set_page_config(page_title="Scenario Sweep", layout="wide")
+
+st.title("🎲 Scenario Sweep: Power, Energy & Quadrant Distributions")
+st.caption("Results are per whole cycle, so they are the same at 50 and 60 Hz.")
+
+mode = st.radio("Scenarios", ["Monte Carlo", "Grid"], horizontal=True)
+hours = st.number_input("Time Interval (hours)", min_value=0.01, value=1.0)
+
+if mode == "Monte Carlo":
+    n = st.number_input("Number of scenarios", min_value=100, max_value=2_000_000, value=100_000, step=10_000)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        V_mean = st.number_input("Voltage mean [V]", value=230.0)
+        V_std = st.number_input("Voltage std [V]", min_value=0.0, value=5.0)
+    with col2:
+        I_low = st.number_input("Current min [A]", min_value=0.0, value=1.0)
+        I_high = st.number_input("Current max [A]", min_value=0.0, value=100.0)
+    with col3:
+        angle_mean = st.slider("Angle mean (°)", -180, 180, 25)
+        angle_std = st.number_input("Angle std (°)", min_value=0.0, value=15.0)
+    h3 = st.slider("3rd harmonic current, up to (%)", 0, 50, 20)
+    h5 = st.slider("5th harmonic current, up to (%)", 0, 50, 10)
+    seed = st.number_input("Random seed", min_value=0, value=0)
+else:
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        V_range = st.slider("Voltage range [V]", 180, 260, (210, 250))
+        V_steps = st.number_input("Voltage steps", min_value=1, value=20)
+    with col2:
+        I_range = st.slider("Current range [A]", 0, 200, (5, 100))
+        I_steps = st.number_input("Current steps", min_value=1, value=20)
+    with col3:
+        angle_range = st.slider("Angle range (°)", -180, 180, (-90, 90))
+        angle_steps = st.number_input("Angle steps", min_value=1, value=37)
+    h3_values = st.multiselect("3rd harmonic current (%)", [0, 5, 10, 20, 30], default=[0, 10])
+
+if st.button("Run Sweep"):
+    with stage('scenarios'):
+        if mode == "Monte Carlo":
+            scenarios = monte_carlo(
+                int(n), int(seed),
+                V=('normal', V_mean, V_std), I=('uniform', I_low, I_high),
+                angle_deg=('normal', angle_mean, angle_std),
+                I_h3=('uniform', 0, h3 / 100), I_h5=('uniform', 0, h5 / 100),
+            )
+            # Keep sampled angles on the -180..180 circle
+            scenarios['angle_deg'] = (scenarios['angle_deg'] + 180) % 360 - 180
+        else:
+            scenarios = grid(
+                V=('linspace', *V_range, int(V_steps)), I=('linspace', *I_range, int(I_steps)),
+                angle_deg=('linspace', *angle_range, int(angle_steps)),
+                I_h3=[h / 100 for h in h3_values or [0]],
+            )
+    with stage('compute'):
+        results = run_sweep(scenarios, hours=hours)
+
+    count = len(results['kW'])
+    st.caption(f"{count:,} scenarios in {results['elapsed'] * 1000:.0f} ms "
+               f"({count / results['elapsed']:,.0f} scenarios/s, {results['chunk']:,} per chunk)")
+
+    with stage('render'):
+        from figure_cache import figure_to_png, render_lock
+        with render_lock:
+            png = figure_to_png(plot_distributions(results))
+    st.image(png, width='stretch')
+
+    st.subheader("📊 Distribution Summary")
+    st.dataframe(summarize(results).round(3), width='stretch', hide_index=True)
+
+    st.subheader("Quadrants")
+    for label, share in quadrant_shares(results).items():
+        st.markdown(f"**{label}:** {share:.1%}")
+
+rerun_timer.report()
@@ -0,0 +1,12 @@
+import base64
+
+from shared_cache import memoize
+
+# --- Static assets, read and encoded once per process ---
+
+
+@memoize('assets', max_entries=32)
+def get_image_base64(file_path):
+    with open(file_path, "rb") as f:
+        data = f.read()
+    return base64.b64encode(data).decode()
@@ -0,0 +1,160 @@
+import argparse
+import csv
+import json
+import os
+import re
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from readings import PHASES, phase_readings, readings_to_dicts
+
+# --- Headless batch of app50.py report bundles (CSV + vector diagram PNG) ---
+
+SCENARIO_COLUMNS = ['name'] + [f'{q}_{p}' for q in ('V', 'I', 'angle') for p in PHASES]
+CSV_NAME = 'three_phase_energy_report.csv'
+PNG_NAME = 'three_phase_vector_diagram.png'
+# Inputs a bundle was rendered from; written last, so it also marks the bundle complete
+INPUTS_NAME = 'inputs.json'
+
+
+def read_scenarios(path, hours=1.0):
+    # One row per meter or scenario: name, V_R..V_B, I_R..I_B, angle_R..angle_B[, hours].
+    # Returns the names, an (n, 3) READING_DTYPE array and the hours.
+    import pandas as pd
+
+    df = pd.read_csv(path, dtype={'name': str})
+    missing = [c for c in SCENARIO_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"{path}: missing columns {missing}")
+    unnamed = np.flatnonzero(df['name'].isna().to_numpy()) + 2
+    if len(unnamed):
+        raise ValueError(f"{path}: rows without a name on lines {unnamed[:10].tolist()}")
+    duplicated = df['name'][df['name'].duplicated()].unique().tolist()
+    if duplicated:
+        raise ValueError(f"{path}: names used more than once {duplicated[:10]}")
+    readings = phase_readings(df[[f'V_{p}' for p in PHASES]].to_numpy(np.float64),
+                              df[[f'I_{p}' for p in PHASES]].to_numpy(np.float64),
+                              df[[f'angle_{p}' for p in PHASES]].to_numpy(np.float64))
+    hours = df['hours'].to_numpy(np.float64) if 'hours' in df.columns else np.full(len(df), hours)
+    return df['name'].tolist(), readings, hours
+
+
+def bundle_dir(output_dir, name):
+    # Names become directory names, so anything path-like is flattened; a
+    # flattened name gets a checksum of the original, so "a/b" and "a_b"
+    # land in different folders. Empty and all-dot names ("." and "..")
+    # would resolve to the output folder or its parent, so they get one too.
+    name = str(name)
+    safe = re.sub(r'[^\w.-]', '_', name)
+    if safe != name or not safe.strip('.'):
+        safe = f'{safe}-{zlib.crc32(name.encode()):08x}'
+    return os.path.join(output_dir, safe)
+
+
+def bundle_inputs(readings, hours):
+    return {'V': readings['V'].tolist(), 'I': readings['I'].tolist(), 'angle_deg': readings['angle_deg'].tolist(),
+            'hours': float(hours)}
+
+
+def bundle_done(output_dir, name, inputs):
+    # Complete and rendered from these same inputs; a changed row is redone
+    path = os.path.join(bundle_dir(output_dir, name), INPUTS_NAME)
+    if not os.path.exists(path):
+        return False
+    with open(path, encoding='utf-8') as f:
+        return json.load(f) == inputs
+
+
+def _write_atomic(path, data):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def use_headless_backend():
+    # Agg before pyplot is first imported: no display, no GUI event loop
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def render_bundle(name, readings, hours, output_dir):
+    from figure_cache import figure_to_png
+    from three_phase_report import energy_report, plot_combined_three_phase_vectors
+
+    started = time.perf_counter()
+    folder = bundle_dir(output_dir, name)
+    os.makedirs(folder, exist_ok=True)
+    v_dict, i_dict, angle_dict = readings_to_dicts(readings)
+    df = energy_report(v_dict, i_dict, angle_dict, float(hours))
+    png = figure_to_png(plot_combined_three_phase_vectors(v_dict, i_dict, angle_dict))
+    # Inputs last: bundle_done only sees a bundle once the PNG and CSV are whole
+    _write_atomic(os.path.join(folder, PNG_NAME), png)
+    _write_atomic(os.path.join(folder, CSV_NAME), df.to_csv(index=False).encode())
+    _write_atomic(os.path.join(folder, INPUTS_NAME), json.dumps(bundle_inputs(readings, hours)).encode())
+    return name, float(df['kWh'].sum()), time.perf_counter() - started
+
+
+def run_batch(names, readings, hours, output_dir='reports', workers=None, progress=print):
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Resume: bundles already rendered from the same inputs are not rendered again
+    pending = [k for k, name in enumerate(names)
+               if not bundle_done(output_dir, name, bundle_inputs(readings[k], hours[k]))]
+    done = len(names) - len(pending)
+    if done and progress:
+        progress(f"resuming: {done}/{len(names)} bundles already complete")
+
+    started = time.perf_counter()
+    if workers == 1:
+        use_headless_backend()
+        results = (render_bundle(names[k], readings[k], hours[k], output_dir) for k in pending)
+        _report_progress(results, output_dir, len(names), done, started, progress)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=use_headless_backend) as pool:
+            futures = [pool.submit(render_bundle, names[k], readings[k], hours[k], output_dir) for k in pending]
+            _report_progress((f.result() for f in as_completed(futures)), output_dir, len(names), done, started,
+                             progress)
+    return len(pending)
+
+
+def _report_progress(results, output_dir, total, done, started, progress):
+    # Each finished bundle is appended to the index as soon as it lands
+    index_path = os.path.join(output_dir, 'index.csv')
+    new_index = not os.path.exists(index_path)
+    rendered = 0
+    with open(index_path, 'a', encoding='utf-8', newline='') as index:
+        writer = csv.writer(index)
+        if new_index:
+            writer.writerow(['name', 'folder', 'kWh', 'seconds'])
+        for name, kWh, elapsed in results:
+            done += 1
+            rendered += 1
+            writer.writerow([name, os.path.basename(bundle_dir(output_dir, name)), f'{kWh:.2f}', f'{elapsed:.3f}'])
+            index.flush()
+            if progress:
+                rate = rendered / (time.perf_counter() - started) * 3600
+                progress(f"[{done}/{total}] {name} in {elapsed:.2f} s, {rate:,.0f} bundles/hour overall")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render app50 report bundles for many meters without Streamlit")
+    parser.add_argument('scenarios', help="CSV with name, V_R..V_B, I_R..I_B, angle_R..angle_B and optional hours")
+    parser.add_argument('--hours', type=float, default=1.0, help="interval for rows without an hours column")
+    parser.add_argument('--output-dir', default='reports')
+    parser.add_argument('--workers', type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument('--quiet', action='store_true', help="only print the final summary")
+    args = parser.parse_args(argv)
+
+    names, readings, hours = read_scenarios(args.scenarios, args.hours)
+    started = time.perf_counter()
+    rendered = run_batch(names, readings, hours, args.output_dir, args.workers, None if args.quiet else print)
+    print(f"{rendered} bundles rendered in {time.perf_counter() - started:.1f} s -> {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import matplotlib
+matplotlib.use('Agg')
+
+from figure_cache import figure_to_png
+from phasor_plots import (plot_single_phase_vectors, plot_single_phase_waveforms, plot_three_phase_vectors,
+                          plot_three_phase_waveforms)
+from power_calc import calculate_power_energy, calculate_power_energy_batch
+from quadrants import classify_quadrant, get_quadrant
+
+# --- Offline benchmarks for the computation and rendering hot paths ---
+
+BATCH_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+WAVEFORM_LENGTHS = [10**3, 10**4, 10**5, 10**6]
+
+
+def best_of(fn, repeat=5, min_time=0.2):
+    # Best per-call time over a few repeats, each long enough to be measurable
+    fn()
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or calls >= 1 << 16:
+            break
+        calls *= 2
+    best = elapsed / calls
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - started) / calls)
+    return best
+
+
+def readings(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(200, 250, n), rng.uniform(0, 100, n), rng.uniform(-180, 180, n)
+
+
+def bench_power(sizes, scalar_limit):
+    results = {}
+    for n in sizes:
+        V, I, angle = readings(n)
+        results[f'power_batch/{n}'] = best_of(lambda: calculate_power_energy_batch(V, I, angle, 0.25), repeat=3)
+        if n <= scalar_limit:
+            rows = list(zip(V.tolist(), I.tolist(), angle.tolist()))
+            results[f'power_scalar/{n}'] = best_of(
+                lambda: [calculate_power_energy(v, i, a, 0.25) for v, i, a in rows], repeat=3)
+    return results
+
+
+def bench_quadrant(sizes, scalar_limit):
+    results = {}
+    for n in sizes:
+        _, _, angle = readings(n)
+        results[f'quadrant_batch/{n}'] = best_of(lambda: classify_quadrant(angle), repeat=3)
+        if n <= scalar_limit:
+            values = angle.tolist()
+            results[f'quadrant_scalar/{n}'] = best_of(lambda: [get_quadrant(a) for a in values], repeat=3)
+    return results
+
+
+def bench_waveform(lengths):
+    # Same synthesis as plot_single_phase_waveforms in phasor_plots.py, over longer time vectors
+    results = {}
+    Vrms, Irms, angle_rad = 230.0, 10.0, np.radians(30)
+    omega = 2 * np.pi * 50
+    for n in lengths:
+        time_vector = np.linspace(0, 0.04 * n / 1000, n)
+
+        def synthesize():
+            v_t = Vrms * np.sqrt(2) * np.sin(omega * time_vector)
+            i_t = Irms * np.sqrt(2) * np.sin(omega * time_vector + angle_rad)
+            return v_t * i_t
+
+        results[f'waveform_synthesis/{n}'] = best_of(synthesize)
+    return results
+
+
+def bench_render():
+    time_vector = np.linspace(0, 0.04, 1000)
+    cases = {
+        'render/App13_vectors': lambda: plot_single_phase_vectors(230.0, 10.0, 30),
+        'render/App13_waveforms': lambda: plot_single_phase_waveforms(230.0, 10.0, np.radians(30), time_vector),
+        'render/app333_vectors': lambda: plot_three_phase_vectors([230.0] * 3, [100.0] * 3, [30, 30, 30]),
+        'render/app333_waveforms': lambda: plot_three_phase_waveforms([230.0] * 3, [100.0] * 3, [30, 30, 30], time_vector),
+    }
+    return {name: best_of(lambda: figure_to_png(draw()), repeat=3, min_time=0) for name, draw in cases.items()}
+
+
+def run(quick=False):
+    sizes = BATCH_SIZES[:3] if quick else BATCH_SIZES
+    lengths = WAVEFORM_LENGTHS[:2] if quick else WAVEFORM_LENGTHS
+    # The per-row Python loops are only timed up to this size
+    scalar_limit = 10**4 if quick else 10**5
+    results = {}
+    results.update(bench_power(sizes, scalar_limit))
+    results.update(bench_quadrant(sizes, scalar_limit))
+    results.update(bench_waveform(lengths))
+    results.update(bench_render())
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'matplotlib': matplotlib.__version__,
+            'machine': platform.machine(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'seconds': results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    # Returns the benchmarks that got slower than baseline * (1 + tolerance)
+    regressions = []
+    print(f"{'benchmark':40s} {'baseline':>12s} {'current':>12s} {'ratio':>7s}")
+    for name, seconds in sorted(current['seconds'].items()):
+        base = baseline['seconds'].get(name)
+        if base is None:
+            print(f"{name:40s} {'-':>12s} {seconds:12.6f} {'new':>7s}")
+            continue
+        ratio = seconds / base
+        flag = ' REGRESSION' if ratio > 1 + tolerance else ''
+        print(f"{name:40s} {base:12.6f} {seconds:12.6f} {ratio:7.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analyzer's computation and rendering hot paths")
+    parser.add_argument('--output', default='bench_output.json', help="where to write the JSON results")
+    parser.add_argument('--compare', metavar='BASELINE', help="baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument('--quick', action='store_true', help="smaller sizes for a fast smoke run")
+    args = parser.parse_args(argv)
+
+    current = run(args.quick)
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    else:
+        for name, seconds in sorted(current['seconds'].items()):
+            print(f"{name:40s} {seconds:12.6f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from io import BytesIO
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- Local load test for compute_service.py ---
+
+
+def request_bodies(rows, binary, count=64, seed=0):
+    # A small pool of distinct payloads, reused round-robin by the clients
+    rng = np.random.default_rng(seed)
+    bodies = []
+    for _ in range(count):
+        data = np.column_stack([rng.uniform(200, 250, rows), rng.uniform(0, 100, rows),
+                                rng.uniform(-180, 180, rows), np.full(rows, 0.25)])
+        if binary:
+            buf = BytesIO()
+            np.save(buf, data)
+            bodies.append(buf.getvalue())
+        else:
+            bodies.append(json.dumps({'V': data[:, 0].tolist(), 'I': data[:, 1].tolist(),
+                                      'angle_deg': data[:, 2].tolist(), 'hours': 0.25}).encode())
+    return bodies
+
+
+async def read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def client(host, port, bodies, content_type, requests, latencies, offset):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for k in range(requests):
+            body = bodies[(offset + k) % len(bodies)]
+            started = time.perf_counter()
+            writer.write(f'POST /compute HTTP/1.1\r\nHost: {host}\r\nContent-Type: {content_type}\r\n'
+                         f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+            await writer.drain()
+            status, _ = await read_response(reader)
+            if status != 200:
+                raise RuntimeError(f"request failed with HTTP {status}")
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def fetch_metrics(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f'GET /metrics HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+    await writer.drain()
+    _, body = await read_response(reader)
+    writer.close()
+    return json.loads(body)
+
+
+async def wait_for_port(host, port, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def load_test(host, port, connections, requests, rows, binary):
+    await wait_for_port(host, port)
+    bodies = request_bodies(rows, binary)
+    content_type = 'application/x-npy' if binary else 'application/json'
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, bodies, content_type, requests, latencies, k)
+                           for k in range(connections)))
+    elapsed = time.perf_counter() - started
+
+    total = connections * requests
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    print(f"{total} requests x {rows} rows ({'npy' if binary else 'json'}) over {connections} connections "
+          f"in {elapsed:.2f} s: {total / elapsed:,.0f} req/s, {total * rows / elapsed:,.0f} rows/s, "
+          f"p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    metrics = await fetch_metrics(host, port)
+    print(f"server: {metrics['batches']} batches, {metrics['mean_requests_per_batch']:.1f} requests/batch, "
+          f"p50 {metrics['latency_ms']['p50']:.2f} ms, p99 {metrics['latency_ms']['p99']:.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the compute service over local HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=200, help="requests per connection")
+    parser.add_argument('--rows', type=int, default=3, help="readings per request")
+    parser.add_argument('--binary', action='store_true', help="send .npy bodies instead of JSON")
+    parser.add_argument('--spawn', action='store_true', help="start compute_service.py for the run")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'compute_service.py'),
+                                   '--host', args.host, '--port', str(args.port)], stdout=subprocess.DEVNULL)
+    try:
+        asyncio.run(load_test(args.host, args.port, args.connections, args.requests, args.rows, args.binary))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
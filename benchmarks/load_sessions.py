@@ -0,0 +1,156 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# --- Local load test: N concurrent Streamlit sessions in one server process ---
+#
+# Each session is an AppTest on its own thread, the way the Streamlit server
+# runs each browser session's script on its own thread, so every session
+# shares this process's caches and memory like real users of one server.
+
+DEFAULT_APPS = ['App13.py', 'app14.py', 'app30.py', 'app333.py', 'app50.py']
+
+
+def rss_mb():
+    # Current resident memory of this process
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def vary_inputs(at, defaults, rng, common):
+    # Each input stays at its default with probability common, otherwise
+    # takes one of a few nearby values, so sessions often share inputs
+    for widget in at.number_input:
+        default = defaults[widget.key]
+        widget.set_value(default if rng.random() < common else default * rng.choice([0.9, 1.1, 1.5]))
+    for widget in at.slider:
+        default = defaults[widget.key]
+        value = default if rng.random() < common else default + rng.choice([-30, 30, 60])
+        widget.set_value(int(min(max(value, widget.min), widget.max)))
+
+
+@contextmanager
+def keep_runtime():
+    # AppTest installs a mock Runtime for each run and clears it when the run
+    # ends, which would pull it from under the other sessions; keep serving
+    # the last one installed instead, like the single Runtime of a real server.
+    # Streamlit's own lookups are put back on exit.
+    from streamlit.runtime import Runtime
+
+    saved = Runtime.__dict__['instance'], Runtime.__dict__['exists']
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        elif not last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(last))
+    try:
+        yield
+    finally:
+        Runtime.instance, Runtime.exists = saved
+
+
+def session(path, reruns, common, seed, latencies, errors):
+    from streamlit.testing.v1 import AppTest
+
+    rng = np.random.default_rng(seed)
+    try:
+        at = AppTest.from_file(os.path.join(ROOT, path), default_timeout=300).run()
+        defaults = {w.key: w.value for w in list(at.number_input) + list(at.slider)}
+        for _ in range(reruns):
+            vary_inputs(at, defaults, rng, common)
+            at.button[0].click()
+            started = time.perf_counter()
+            at.run()
+            latencies.append((path, time.perf_counter() - started))
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+    except Exception as exc:
+        errors.append(f"{path} session {seed}: {exc}")
+
+
+def load_test(apps, sessions, reruns, common, seed=0):
+    # Scripts open tata_logo.png and friends by relative path
+    os.chdir(ROOT)
+    import shared_cache
+    from perf import cache_counters
+    from streamlit.testing.v1 import AppTest  # noqa: F401, so the baseline includes Streamlit itself
+
+    baseline = rss_mb()
+    latencies, errors = [], []
+    threads = [threading.Thread(target=session, args=(apps[k % len(apps)], reruns, common, seed + k,
+                                                      latencies, errors))
+               for k in range(sessions)]
+    with keep_runtime():
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+    for message in errors:
+        print(f"error: {message}")
+    if not latencies:
+        return
+    ms = np.array([seconds for _, seconds in latencies]) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    print(f"{sessions} sessions x {reruns} reruns, shared caches {'on' if shared_cache.enabled else 'off'}: "
+          f"{len(ms)} reruns in {elapsed:.1f} s ({len(ms) / elapsed:.1f}/s), "
+          f"p50 {p50:.0f} ms, p95 {p95:.0f} ms, p99 {p99:.0f} ms")
+    for path in apps:
+        app_ms = np.array([seconds for p, seconds in latencies if p == path]) * 1000
+        if len(app_ms):
+            a50, a99 = np.percentile(app_ms, [50, 99])
+            print(f"  {path:<12} {len(app_ms):>5} reruns  p50 {a50:7.0f} ms  p99 {a99:7.0f} ms")
+    print(f"memory: {baseline:.0f} MB before, {rss_mb():.0f} MB after, {peak_rss_mb():.0f} MB peak")
+    counts = {}
+    for name, labels, value in cache_counters():
+        if name == 'analyzer_shared_cache_total':
+            counts.setdefault(labels['cache'], {})[labels['result']] = value
+    for cache, c in sorted(counts.items()):
+        print(f"  cache {cache:<14} {c['hit']:>6} hits {c['miss']:>6} misses {c['wait']:>4} waits")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit apps with concurrent sessions")
+    parser.add_argument('apps', nargs='*', default=DEFAULT_APPS, help="app scripts, assigned round-robin")
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--reruns', type=int, default=20, help="input changes + reruns per session")
+    parser.add_argument('--common', type=float, default=0.7,
+                        help="chance an input stays at its default (230 V / 10 A / 0° and so on)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compare', action='store_true',
+                        help="run twice in fresh processes, with the shared caches on and off")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        command = [sys.executable, os.path.abspath(__file__), *args.apps, '--sessions', str(args.sessions),
+                   '--reruns', str(args.reruns), '--common', str(args.common), '--seed', str(args.seed)]
+        for value in ('1', '0'):
+            subprocess.run(command, env={**os.environ, 'ANALYZER_SHARED_CACHE': value}, check=True)
+        return
+    load_test(args.apps, args.sessions, args.reruns, args.common, args.seed)
+
+
+if __name__ == '__main__':
+    main()
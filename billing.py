@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+
+# --- Maximum demand and time-of-day billing from interval energy ---
+
+# (name, start hour, end hour); a slot may wrap past midnight
+TOD_SLOTS = [
+    ('Off-peak', 22, 6),
+    ('Normal', 6, 18),
+    ('Peak', 18, 22),
+]
+PHASES = ['R', 'Y', 'B']
+
+
+def interval_starts(timestamps, interval_minutes, interval_ending=True):
+    # Meter load profiles stamp the end of each interval by default
+    ts = np.asarray(timestamps, dtype='datetime64[m]')
+    return ts - np.timedelta64(int(interval_minutes), 'm') if interval_ending else ts
+
+
+def regularize(starts, kWh, kVAh, interval_minutes):
+    # Sorted onto a gap-free grid of intervals. A repeated interval keeps its
+    # last reading; missing intervals hold zero energy and present=False.
+    order = np.argsort(starts, kind='stable')
+    starts, kWh, kVAh = starts[order], kWh[order], kVAh[order]
+    step = int(interval_minutes)
+    if not len(starts):
+        return starts, kWh, kVAh, np.zeros(0, dtype=bool), 0
+    slot = (starts - starts[0]).astype(np.int64) // step
+    last = np.concatenate([slot[1:] != slot[:-1], [True]])
+    n = int(slot[-1]) + 1
+    grid = []
+    for energy in (kWh, kVAh):
+        filled = np.zeros((n,) + energy.shape[1:])
+        filled[slot[last]] = energy[last]
+        grid.append(filled)
+    present = np.zeros(n, dtype=bool)
+    present[slot] = True
+    grid_starts = starts[0] + np.arange(n) * np.timedelta64(step, 'm')
+    return grid_starts, grid[0], grid[1], present, int(len(slot) - last.sum())
+
+
+def rolling_demand(energy, window_intervals, interval_minutes):
+    # Sliding-window sums from one cumulative sum: O(n) whatever the window.
+    # Rows are taken as consecutive intervals, so fill gaps before calling.
+    energy = np.asarray(energy, dtype=np.float64)
+    csum = np.concatenate([np.zeros((1,) + energy.shape[1:]), np.cumsum(energy, axis=0)])
+    sums = csum[window_intervals:] - csum[:-window_intervals]
+    return sums / (window_intervals * interval_minutes / 60)
+
+
+def block_demand(energy, starts, block_minutes, covered_minutes=None):
+    # Clock-aligned blocks (e.g. :00/:30) summed with reduceat, gaps allowed.
+    # covered_minutes (per row) prorates each block over the time it has
+    # readings for; a block without any is NaN.
+    energy = np.asarray(energy, dtype=np.float64)
+    if not len(energy):
+        return np.empty((0,) + energy.shape[1:]), starts[:0]
+    block_id = starts.astype(np.int64) // block_minutes
+    first = np.flatnonzero(np.concatenate([[True], block_id[1:] != block_id[:-1]]))
+    sums = np.add.reduceat(energy, first, axis=0)
+    block_starts = (block_id[first] * block_minutes).astype('datetime64[m]')
+    if covered_minutes is None:
+        return sums / (block_minutes / 60), block_starts
+    hours = np.add.reduceat(covered_minutes, first) / 60
+    hours = hours.reshape((-1,) + (1,) * (energy.ndim - 1))
+    demand = np.divide(sums, hours, out=np.full(sums.shape, np.nan), where=hours > 0)
+    return demand, block_starts
+
+
+def tod_slot_index(starts, slots=TOD_SLOTS):
+    # Minute-of-day lookup table, then one fancy index per interval
+    table = np.full(24 * 60, -1, dtype=np.int16)
+    for k, (_, start, end) in enumerate(slots):
+        if start < end:
+            table[start * 60:end * 60] = k
+        else:
+            table[start * 60:] = k
+            table[:end * 60] = k
+    minute_of_day = (starts - starts.astype('datetime64[D]')).astype(np.int64)
+    return table[minute_of_day]
+
+
+def tod_totals(energy, slot_index, n_slots):
+    # Per-slot sums for every column at once via a one-hot matmul
+    energy = np.asarray(energy, dtype=np.float64)
+    flat = energy.reshape(len(energy), int(np.prod(energy.shape[1:])))
+    onehot = (slot_index[:, None] == np.arange(n_slots)[None, :]).astype(np.float64)
+    return (onehot.T @ flat).reshape((n_slots,) + energy.shape[1:])
+
+
+def max_with_time(values, times):
+    # NaN entries never win; with nothing to compare the result is NaN at NaT
+    if not len(values):
+        return np.full(values.shape[1:], np.nan), np.full(values.shape[1:], np.datetime64('NaT', 'm'))
+    idx = np.argmax(np.where(np.isnan(values), -np.inf, values), axis=0)
+    best = np.take_along_axis(values, idx[None], axis=0)[0]
+    return best, np.where(np.isnan(best), np.datetime64('NaT', 'm'), times[idx])
+
+
+def billing_summary(timestamps, kWh, kVAh, interval_minutes=15, demand_minutes=30, slots=TOD_SLOTS,
+                    interval_ending=True):
+    # kWh/kVAh are (intervals, ...) with any trailing shape (phases, meters).
+    # Gaps and repeated timestamps are counted in the summary: block demand
+    # is prorated over the minutes a block has readings for, and rolling
+    # windows that span a missing interval are left out of the maximum.
+    starts = interval_starts(timestamps, interval_minutes, interval_ending)
+    kWh = np.asarray(kWh, dtype=np.float64)
+    kVAh = np.asarray(kVAh, dtype=np.float64)
+    starts, kWh, kVAh, present, duplicates = regularize(starts, kWh, kVAh, interval_minutes)
+    covered = present * float(interval_minutes)
+
+    block_kW, block_times = block_demand(kWh, starts, demand_minutes, covered)
+    block_kVA, _ = block_demand(kVAh, starts, demand_minutes, covered)
+    window = max(1, int(round(demand_minutes / interval_minutes)))
+    roll_kW = rolling_demand(kWh, window, interval_minutes)
+    roll_kVA = rolling_demand(kVAh, window, interval_minutes)
+    missing = np.concatenate([[0], np.cumsum(~present)])
+    incomplete = (missing[window:] - missing[:-window] > 0).reshape((-1,) + (1,) * (kWh.ndim - 1))
+    roll_kW = np.where(incomplete, np.nan, roll_kW)
+    roll_kVA = np.where(incomplete, np.nan, roll_kVA)
+    # A rolling window is stamped with the start of its first interval
+    roll_times = starts[:len(roll_kW)]
+
+    shape = kWh.shape[1:]
+    summary = {
+        'kWh': kWh.sum(axis=0),
+        'kVAh': kVAh.sum(axis=0),
+        'missing_intervals': np.full(shape, int((~present).sum())),
+        'duplicate_intervals': np.full(shape, duplicates),
+    }
+    summary['MD_kW'], summary['MD_kW_at'] = max_with_time(block_kW, block_times)
+    summary['MD_kVA'], summary['MD_kVA_at'] = max_with_time(block_kVA, block_times)
+    summary['MD_kW_rolling'], summary['MD_kW_rolling_at'] = max_with_time(roll_kW, roll_times)
+    summary['MD_kVA_rolling'], summary['MD_kVA_rolling_at'] = max_with_time(roll_kVA, roll_times)
+
+    slot_index = tod_slot_index(starts, slots)
+    slot_kWh = tod_totals(kWh, slot_index, len(slots))
+    slot_kVAh = tod_totals(kVAh, slot_index, len(slots))
+    for k, (name, _, _) in enumerate(slots):
+        summary[f'{name} kWh'] = slot_kWh[k]
+        summary[f'{name} kVAh'] = slot_kVAh[k]
+    return summary
+
+
+def _with_total(phases):
+    return np.column_stack([phases, phases.sum(axis=1)])
+
+
+def billing_report(timestamps, kWh, kVAh, interval_minutes=15, demand_minutes=30, slots=TOD_SLOTS,
+                   interval_ending=True):
+    # Per-phase rows plus a Total row, like the app50.py report. The total's
+    # demand comes from the summed phases, not the sum of phase maxima.
+    kWh = np.asarray(kWh, dtype=np.float64)
+    kVAh = np.asarray(kVAh, dtype=np.float64)
+    if kWh.ndim == 1:
+        kWh, kVAh = kWh.reshape(-1, 1), kVAh.reshape(-1, 1)
+    summary = billing_summary(timestamps, _with_total(kWh), _with_total(kVAh), interval_minutes, demand_minutes,
+                              slots, interval_ending)
+    df = pd.DataFrame(summary)
+    df.insert(0, 'Phase', PHASES[:kWh.shape[1]] + ['Total'])
+    return df
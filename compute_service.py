@@ -0,0 +1,317 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from io import BytesIO
+
+import numpy as np
+
+from power_calc import POWER_COLUMNS, calculate_power_energy_batch
+from quadrants import QUADRANT_LABELS, classify_quadrant
+
+# --- Async HTTP service for the power/energy/quadrant core, with micro-batching ---
+
+INPUT_COLUMNS = ['V', 'I', 'angle_deg', 'hours']
+OUTPUT_COLUMNS = POWER_COLUMNS + ['quadrant']
+NPY_TYPE = 'application/x-npy'
+JSON_TYPE = 'application/json'
+MAX_BODY = 64 * 1024 * 1024
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_json_rows(body):
+    # {"V": [...], "I": [...], "angle_deg": [...], "hours": [...] or one number}
+    try:
+        data = json.loads(body)
+        V = np.atleast_1d(np.asarray(data['V'], dtype=np.float64))
+        columns = [V] + [np.broadcast_to(np.asarray(data[name], dtype=np.float64), V.shape)
+                         for name in INPUT_COLUMNS[1:]]
+    except KeyError as exc:
+        raise RequestError(400, f"bad JSON request: missing field {exc}")
+    except (ValueError, TypeError) as exc:
+        raise RequestError(400, f"bad JSON request: {exc}")
+    if V.ndim != 1:
+        raise RequestError(400, "bad JSON request: V must be a flat list")
+    return np.column_stack(columns)
+
+
+def parse_npy_rows(body):
+    # One (n, 4) float64 array with columns V, I, angle_deg, hours
+    try:
+        rows = np.load(BytesIO(body), allow_pickle=False)
+    except (ValueError, OSError) as exc:
+        raise RequestError(400, f"bad .npy request: {exc}")
+    if not isinstance(rows, np.ndarray):
+        raise RequestError(400, "bad .npy request: expected one .npy array, not an .npz archive")
+    if rows.ndim != 2 or rows.shape[1] != len(INPUT_COLUMNS):
+        raise RequestError(400, f"bad .npy request: expected shape (n, {len(INPUT_COLUMNS)}), got {rows.shape}")
+    if rows.dtype.kind not in 'biuf':
+        raise RequestError(400, f"bad .npy request: expected numbers, got dtype {rows.dtype}")
+    return rows.astype(np.float64, copy=False)
+
+
+def compute_rows(rows):
+    # (n, 4) inputs -> (n, 7) outputs: the POWER_COLUMNS, then quadrant code
+    result = calculate_power_energy_batch(rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3])
+    out = np.empty((len(rows), len(OUTPUT_COLUMNS)))
+    for k, name in enumerate(POWER_COLUMNS):
+        out[:, k] = result[name]
+    out[:, -1] = classify_quadrant(rows[:, 2])
+    return out
+
+
+def json_result(out):
+    result = {name: out[:, k].tolist() for k, name in enumerate(POWER_COLUMNS)}
+    codes = out[:, -1].astype(np.int64)
+    result['quadrant'] = codes.tolist()
+    result['quadrant_label'] = [QUADRANT_LABELS[c] for c in codes]
+    return json.dumps(result).encode()
+
+
+def npy_result(out):
+    buf = BytesIO()
+    np.save(buf, out, allow_pickle=False)
+    return buf.getvalue()
+
+
+class Metrics:
+    # Counters plus a window of recent latencies for percentiles
+
+    def __init__(self, window=10000):
+        self.started = time.time()
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self.server_errors = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+
+    def observe_request(self, rows, latency):
+        self.requests += 1
+        self.rows += rows
+        self.latencies.append(latency)
+
+    def observe_batch(self, requests, rows):
+        self.batches += 1
+        self.batch_rows += rows
+        self.batch_sizes.append(requests)
+
+    def snapshot(self):
+        uptime = time.time() - self.started
+        latencies = np.array(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+        return {
+            'uptime_s': uptime,
+            'requests': self.requests,
+            'rows': self.rows,
+            'errors': self.errors,
+            'server_errors': self.server_errors,
+            'batches': self.batches,
+            'requests_per_s': self.requests / uptime if uptime else 0.0,
+            'mean_requests_per_batch': float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.0,
+            'mean_rows_per_batch': self.batch_rows / self.batches if self.batches else 0.0,
+            'latency_ms': {'p50': float(p50), 'p95': float(p95), 'p99': float(p99)},
+        }
+
+
+class MicroBatcher:
+    # Requests wait on a queue; the batch loop waits up to max_delay after
+    # the first request (or until max_rows) for more, runs one vector
+    # computation over all of it and splits the result back per caller.
+
+    def __init__(self, metrics, max_rows=65536, max_delay=0.002):
+        self.metrics = metrics
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def compute(self, rows):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        n = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_delay
+        while n < self.max_rows:
+            if self._queue.empty():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            batch.append(item)
+            n += len(item[0])
+        return batch, n
+
+    async def _run(self):
+        while True:
+            batch, n = await self._collect()
+            try:
+                out = compute_rows(np.concatenate([rows for rows, _ in batch]))
+                parts = np.split(out, np.cumsum([len(rows) for rows, _ in batch])[:-1])
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.metrics.observe_batch(len(batch), n)
+            for (_, future), part in zip(batch, parts):
+                if not future.done():
+                    future.set_result(part)
+
+
+class ComputeService:
+
+    def __init__(self, max_rows=65536, max_delay=0.002):
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(self.metrics, max_rows, max_delay)
+
+    async def start(self, host='127.0.0.1', port=8050):
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._serve_connection, host, port)
+        return self.server
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def _serve_connection(self, reader, writer):
+        # HTTP/1.1 with keep-alive; one request at a time per connection
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+                    self.metrics.errors += 1
+                    await self._respond(writer, 400, JSON_TYPE, json.dumps({'error': 'bad request line'}).encode(),
+                                        keep_alive=False)
+                    break
+                method, path, version = parts
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    self.metrics.errors += 1
+                    await self._respond(writer, 400, JSON_TYPE, json.dumps({'error': 'bad Content-Length'}).encode(),
+                                        keep_alive=False)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, JSON_TYPE, json.dumps({'error': 'request too large'}).encode(),
+                                        keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, content_type, payload = await self._handle(method, path.split('?')[0], headers, body)
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                await self._respond(writer, status, content_type, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, method, path, headers, body):
+        # Any unexpected failure still gets a response and is counted; errors
+        # counts every failed request, server_errors only these
+        try:
+            return await self._route(method, path, headers, body)
+        except Exception as exc:
+            self.metrics.errors += 1
+            self.metrics.server_errors += 1
+            return 500, JSON_TYPE, json.dumps({'error': f'internal error: {exc}'}).encode()
+
+    async def _route(self, method, path, headers, body):
+        if path == '/metrics':
+            return 200, JSON_TYPE, json.dumps(self.metrics.snapshot()).encode()
+        if path == '/health':
+            return 200, JSON_TYPE, b'{"status": "ok"}'
+        if path != '/compute':
+            return 404, JSON_TYPE, json.dumps({'error': f'no such endpoint {path}'}).encode()
+        if method != 'POST':
+            return 405, JSON_TYPE, json.dumps({'error': 'use POST'}).encode()
+
+        started = time.perf_counter()
+        binary = headers.get('content-type', JSON_TYPE).startswith(NPY_TYPE)
+        try:
+            rows = parse_npy_rows(body) if binary else parse_json_rows(body)
+        except RequestError as exc:
+            self.metrics.errors += 1
+            return exc.status, JSON_TYPE, json.dumps({'error': str(exc)}).encode()
+        out = await self.batcher.compute(rows)
+        payload = npy_result(out) if binary else json_result(out)
+        self.metrics.observe_request(len(rows), time.perf_counter() - started)
+        return 200, NPY_TYPE if binary else JSON_TYPE, payload
+
+    async def _respond(self, writer, status, content_type, payload, keep_alive=True):
+        head = (f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                f'Content-Type: {content_type}\r\n'
+                f'Content-Length: {len(payload)}\r\n'
+                f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+        writer.write(head.encode('latin-1') + payload)
+        await writer.drain()
+
+
+async def serve(host, port, max_rows, max_delay):
+    service = ComputeService(max_rows, max_delay)
+    server = await service.start(host, port)
+    print(f"compute service on http://{host}:{port} (POST /compute, GET /metrics)", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve kW/kVAR/kVA/energy/quadrant calculations over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--max-rows', type=int, default=65536, help="largest merged batch")
+    parser.add_argument('--max-delay', type=float, default=0.002, help="seconds a batch waits for more requests")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_rows, args.max_delay))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
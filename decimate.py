@@ -0,0 +1,111 @@
+import numpy as np
+
+# --- Downsampling long series to roughly the pixel width of a plot ---
+
+
+def minmax_decimate(t, y, n_buckets):
+    # Keeps each bucket's min and max in time order, so peaks survive
+    t = np.asarray(t)
+    y = np.asarray(y)
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return t, y
+    k = -(-n // n_buckets)  # samples per bucket, rounded up
+    full = n // k * k
+    buckets = y[:full].reshape(-1, k)
+    lo = buckets.argmin(axis=1)
+    hi = buckets.argmax(axis=1)
+    base = np.arange(len(buckets)) * k
+    idx = np.sort(np.stack([base + lo, base + hi], axis=1), axis=1).ravel()
+    if full < n:
+        tail = y[full:]
+        idx = np.concatenate([idx, np.sort([full + tail.argmin(), full + tail.argmax()])])
+    return t[idx], y[idx]
+
+
+def lttb(t, y, n_out):
+    # Largest-triangle-three-buckets: one point per bucket, chosen to keep the
+    # visual shape. Sequential by nature, but each step is a vector op over
+    # one bucket, so the Python loop runs n_out times, not len(y) times.
+    t = np.asarray(t, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return t, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        next_stop = edges[b + 2] if b + 2 < len(edges) else n
+        # Average of the next bucket is the triangle's third vertex
+        t_next = t[stop:next_stop].mean() if next_stop > stop else t[-1]
+        y_next = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        area = np.abs((t[prev] - t_next) * (y[start:stop] - y[prev])
+                      - (t[prev] - t[start:stop]) * (y_next - y[prev]))
+        prev = start + int(area.argmax())
+        selected[b + 1] = prev
+    return t[selected], y[selected]
+
+
+def decimate(t, y, n_points, method='minmax'):
+    if method == 'minmax':
+        return minmax_decimate(t, y, max(1, n_points // 2))
+    if method == 'lttb':
+        return lttb(t, y, n_points)
+    raise ValueError(f"unknown decimation method {method!r}")
+
+
+def plot_width_points(ax):
+    # About one point per horizontal pixel of the axes
+    bbox = ax.get_window_extent()
+    return max(200, int(bbox.width))
+
+
+def plot_decimated(ax, t, y, method='minmax', **kwargs):
+    # Plots a decimated copy and, on interactive backends, re-decimates the
+    # visible range whenever the user zooms or pans.
+    t = np.asarray(t)
+    y = np.asarray(y)
+    width = plot_width_points(ax)
+    if len(t) <= 2 * width:
+        return ax.plot(t, y, **kwargs)[0]
+    line, = ax.plot(*decimate(t, y, width, method), **kwargs)
+
+    def on_xlim_changed(axes):
+        lo, hi = axes.get_xlim()
+        start, stop = np.searchsorted(t, [lo, hi])
+        start, stop = max(start - 1, 0), min(stop + 1, len(t))
+        line.set_data(*decimate(t[start:stop], y[start:stop], plot_width_points(axes), method))
+
+    ax.callbacks.connect('xlim_changed', on_xlim_changed)
+    return line
+
+
+def envelope(read, start, stop, n_buckets, chunk_buckets=4096):
+    # Min/max per bucket of samples [start, stop) fetched through read(a, b)
+    # in bounded chunks, so a multi-GB memory-mapped record is reduced
+    # without ever materializing the whole range. Returns (lo, hi, k) with
+    # k samples per bucket; the last bucket may be shorter.
+    n = stop - start
+    k = max(1, -(-n // n_buckets))
+    lo_parts, hi_parts = [], []
+    for chunk_start in range(start, stop, k * chunk_buckets):
+        values = read(chunk_start, min(chunk_start + k * chunk_buckets, stop))
+        full = len(values) // k * k
+        if full:
+            buckets = values[:full].reshape(-1, k)
+            lo_parts.append(buckets.min(axis=1))
+            hi_parts.append(buckets.max(axis=1))
+        if full < len(values):
+            lo_parts.append(values[full:].min(keepdims=True))
+            hi_parts.append(values[full:].max(keepdims=True))
+    if not lo_parts:
+        return np.empty(0), np.empty(0), k
+    return np.concatenate(lo_parts), np.concatenate(hi_parts), k
+
+
+def envelope_line(t_bucket, lo, hi):
+    # Interleaves lo/hi at each bucket time so one line draws the envelope
+    return np.repeat(t_bucket, 2), np.stack([lo, hi], axis=1).ravel()
@@ -0,0 +1,49 @@
+import threading
+from io import BytesIO
+
+from perf import stage
+from shared_cache import SharedCache, caches, make_key
+
+# --- Process-wide LRU cache of rendered figures, stored as PNG bytes ---
+
+# Same savefig options st.pyplot uses, so cached images look identical
+SAVEFIG_OPTIONS = {'format': 'png', 'bbox_inches': 'tight', 'dpi': 200}
+
+# pyplot keeps global state and is not thread-safe; sessions draw one at a time
+render_lock = threading.RLock()
+
+
+def figure_to_png(fig):
+    # pyplot is only needed once something is actually drawn
+    import matplotlib.pyplot as plt
+
+    buf = BytesIO()
+    fig.savefig(buf, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+class FigureCache(SharedCache):
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        super().__init__('figures', max_entries, max_bytes, sizeof=len)
+
+    def render(self, key, draw):
+        # draw() builds the figure; it is rendered and closed only on a miss,
+        # and only once when several sessions ask for the same key together
+        return self.get_or_compute(key, lambda: self._render(draw))
+
+    def _render(self, draw):
+        with render_lock:
+            with stage('render'):
+                fig = draw()
+            with stage('encode'):
+                return figure_to_png(fig)
+
+
+figure_cache = FigureCache()
+caches[figure_cache.name] = figure_cache
+
+
+def cached_png(name, draw, *inputs):
+    return figure_cache.render((name,) + make_key(inputs), draw)
@@ -0,0 +1,155 @@
+import argparse
+import glob
+import json
+import os
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from load_profile import ENERGY_COLUMNS, LoadProfileAccumulator, ingest_load_profile, sort_report
+from quadrants import REGISTER_NAMES
+
+# --- Fleet-wide energy/register run, sharded by meter ID over a process pool ---
+
+
+def meter_id_of(path):
+    # Meter files are named after the meter, e.g. M000123.csv.gz -> M000123
+    return os.path.basename(path).split('.')[0]
+
+
+def shard_of(meter_id, n_shards):
+    # crc32 rather than hash() so shard assignment is stable across runs
+    return zlib.crc32(meter_id.encode()) % n_shards
+
+
+def plan_shards(paths, n_shards):
+    shards = {}
+    for path in sorted(paths):
+        shards.setdefault(shard_of(meter_id_of(path), n_shards), []).append(path)
+    return shards
+
+
+def shard_path(checkpoint_dir, shard_id):
+    return os.path.join(checkpoint_dir, f'shard-{shard_id:05d}.csv')
+
+
+def fleet_manifest(paths, interval_minutes, n_shards):
+    # Everything a shard's result depends on; checkpoints written under a
+    # different manifest map meters to other shards or cover other files
+    inputs = []
+    for path in sorted(paths):
+        st = os.stat(path)
+        inputs.append([os.path.abspath(path), st.st_size, st.st_mtime_ns])
+    return {'interval_minutes': float(interval_minutes), 'n_shards': n_shards, 'inputs': inputs}
+
+
+def prepare_checkpoints(checkpoint_dir, manifest, progress=print):
+    # Keep the checkpoints only if they were written for this exact run
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    manifest_path = os.path.join(checkpoint_dir, 'manifest.json')
+    old = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            old = json.load(f)
+    if old == manifest:
+        return
+    stale = glob.glob(os.path.join(checkpoint_dir, 'shard-*.csv'))
+    if stale and progress:
+        progress(f"inputs, interval or shard count changed: discarding {len(stale)} old checkpoints")
+    for path in stale:
+        os.remove(path)
+    fd, tmp = tempfile.mkstemp(dir=checkpoint_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, manifest_path)
+
+
+def run_shard(shard_id, paths, interval_minutes, checkpoint_dir):
+    acc = ingest_load_profile(paths, interval_minutes, accumulator=LoadProfileAccumulator(interval_minutes, registers=True))
+    report = acc.report()
+    # Write then rename, so a crash never leaves a half-written checkpoint
+    final = shard_path(checkpoint_dir, shard_id)
+    tmp = final + '.tmp'
+    report.to_csv(tmp, index=False, float_format='%.17g')
+    os.replace(tmp, final)
+    return shard_id, acc.rows, acc.rejected, acc.elapsed
+
+
+def run_fleet(paths, interval_minutes=15, workers=None, n_shards=None, checkpoint_dir='fleet_checkpoints',
+              progress=print):
+    workers = workers or os.cpu_count() or 1
+    n_shards = n_shards or workers * 4
+    prepare_checkpoints(checkpoint_dir, fleet_manifest(paths, interval_minutes, n_shards), progress)
+
+    shards = plan_shards(paths, n_shards)
+    # Resume: shards with a finished checkpoint are not recomputed
+    pending = {s: p for s, p in shards.items() if not os.path.exists(shard_path(checkpoint_dir, s))}
+    done = len(shards) - len(pending)
+    if done and progress:
+        progress(f"resuming: {done}/{len(shards)} shards already complete")
+
+    started = time.perf_counter()
+    if workers == 1:
+        results = (run_shard(s, p, interval_minutes, checkpoint_dir) for s, p in pending.items())
+        _report_progress(results, len(shards), done, started, progress)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_shard, s, p, interval_minutes, checkpoint_dir) for s, p in pending.items()]
+            _report_progress((f.result() for f in as_completed(futures)), len(shards), done, started, progress)
+
+    return merge_shards(checkpoint_dir, sorted(shards))
+
+
+def _report_progress(results, total, done, started, progress):
+    rows = 0
+    for shard_id, shard_rows, rejected, elapsed in results:
+        done += 1
+        rows += shard_rows
+        if progress:
+            rate = rows / (time.perf_counter() - started)
+            progress(f"[{done}/{total}] shard {shard_id}: {shard_rows} rows ({rejected} rejected) "
+                     f"in {elapsed:.1f} s, {rate:,.0f} rows/s overall")
+
+
+def merge_shards(checkpoint_dir, shard_ids):
+    # round_trip parses the %.17g text back to the exact doubles that were written;
+    # the dtypes are fixed so an all-zero register column stays float
+    dtype = {'Meter': str, 'Phase': str, **{name: 'float64' for name in ENERGY_COLUMNS + REGISTER_NAMES}}
+    frames = [pd.read_csv(shard_path(checkpoint_dir, s), dtype=dtype, float_precision='round_trip')
+              for s in shard_ids]
+    return sort_report(pd.concat(frames, ignore_index=True))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute energy and quadrant registers for a fleet of meter files")
+    parser.add_argument('inputs', nargs='+', help="meter CSV files or directories holding them")
+    parser.add_argument('--interval', type=float, default=15, help="interval length in minutes")
+    parser.add_argument('--workers', type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument('--shards', type=int, default=None, help="shard count (default: 4 per worker)")
+    parser.add_argument('--checkpoint-dir', default='fleet_checkpoints')
+    parser.add_argument('--output', default='fleet_energy_report.csv')
+    parser.add_argument('--verify', action='store_true', help="also run serially and check the reports match")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for item in args.inputs:
+        if os.path.isdir(item):
+            paths += glob.glob(os.path.join(item, '*.csv')) + glob.glob(os.path.join(item, '*.csv.gz'))
+        else:
+            paths.append(item)
+
+    report = run_fleet(paths, args.interval, args.workers, args.shards, args.checkpoint_dir)
+    report.to_csv(args.output, index=False)
+    if args.verify:
+        serial = ingest_load_profile(sorted(paths), args.interval,
+                                     accumulator=LoadProfileAccumulator(args.interval, registers=True)).report()
+        pd.testing.assert_frame_equal(report, serial, check_exact=True)
+        print("fleet report matches the serial report exactly")
+    print(f"{report['Meter'].nunique()} meters -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
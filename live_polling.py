@@ -0,0 +1,203 @@
+import argparse
+import asyncio
+import struct
+import threading
+import time
+
+import numpy as np
+
+from power_calc import calculate_power_energy_batch
+from quadrants import classify_quadrant
+
+# --- Async Modbus TCP polling of meters for the live dashboard ---
+
+PHASES = ['R', 'Y', 'B']
+# Holding registers 0..17: big-endian float32 V_R..V_B, I_R..I_B, angle_R..angle_B
+REGISTER_MAP = [f'{q}_{p}' for q in ('V', 'I', 'angle') for p in PHASES]
+REGISTER_START = 0
+REGISTER_COUNT = 2 * len(REGISTER_MAP)
+READ_HOLDING_REGISTERS = 0x03
+
+
+class ModbusError(Exception):
+    pass
+
+
+def parse_meters(spec):
+    # "host:port[:unit]" items, comma separated; "host:15000-15099" expands a port range
+    meters = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, ports, *unit = item.split(':')
+        unit = int(unit[0]) if unit else 1
+        first, _, last = ports.partition('-')
+        for port in range(int(first), int(last or first) + 1):
+            meters.append((host, port, unit))
+    return meters
+
+
+class MeterConnection:
+    # One persistent TCP connection per meter, reopened after any failure
+
+    def __init__(self, host, port, unit):
+        self.host, self.port, self.unit = host, port, unit
+        self._reader = self._writer = None
+        self._transaction = 0
+
+    @property
+    def name(self):
+        return f'{self.host}:{self.port}/{self.unit}'
+
+    async def read_registers(self, start, count):
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._transaction = (self._transaction + 1) & 0xFFFF
+        request = struct.pack('>HHHBBHH', self._transaction, 0, 6, self.unit, READ_HOLDING_REGISTERS, start, count)
+        self._writer.write(request)
+        await self._writer.drain()
+
+        transaction, _, length, _ = struct.unpack('>HHHB', await self._reader.readexactly(7))
+        pdu = await self._reader.readexactly(length - 1)
+        if transaction != self._transaction:
+            raise ModbusError(f"{self.name}: transaction id mismatch")
+        if pdu[0] & 0x80:
+            raise ModbusError(f"{self.name}: exception code {pdu[1]}")
+        return pdu[2:2 + pdu[1]]
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+
+class MeterPoller:
+    # Polls many meters concurrently; the semaphore bounds how many requests
+    # are in flight at once. Connections are kept open between rounds only
+    # while the fleet fits in max_connections, otherwise each one is closed
+    # after its read so open sockets never exceed max_concurrency.
+
+    def __init__(self, meters, max_concurrency=100, timeout=2.0, max_connections=256):
+        self.connections = [MeterConnection(*m) for m in meters]
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.persistent = len(self.connections) <= max_connections
+        self._semaphore = None
+
+    async def _poll_one(self, conn):
+        async with self._semaphore:
+            try:
+                payload = await asyncio.wait_for(conn.read_registers(REGISTER_START, REGISTER_COUNT), self.timeout)
+                if not self.persistent:
+                    await conn.close()
+                return struct.unpack(f'>{len(REGISTER_MAP)}f', payload), None
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ModbusError, struct.error) as exc:
+                await conn.close()
+                return None, f'{type(exc).__name__}: {exc}' if str(exc) else type(exc).__name__
+
+    async def poll(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        started = time.perf_counter()
+        replies = await asyncio.gather(*(self._poll_one(conn) for conn in self.connections))
+        return build_snapshot(self.connections, replies, time.perf_counter() - started)
+
+    async def close(self):
+        await asyncio.gather(*(conn.close() for conn in self.connections))
+
+
+def build_snapshot(connections, replies, elapsed):
+    # All meters' readings go through the batch power/quadrant code at once
+    values = np.full((len(connections), len(REGISTER_MAP)), np.nan)
+    errors = {}
+    for k, (conn, (reading, error)) in enumerate(zip(connections, replies)):
+        if reading is None:
+            errors[conn.name] = error
+        else:
+            values[k] = reading
+    V, I, angle = values[:, 0:3], values[:, 3:6], values[:, 6:9]
+    power = calculate_power_energy_batch(V, I, angle, 0)
+    return {
+        'meters': [conn.name for conn in connections],
+        'V': V, 'I': I, 'angle_deg': angle,
+        'kW': power['kW'], 'kVAR': power['kVAR'], 'kVA': power['kVA'],
+        'quadrant': classify_quadrant(angle),
+        'errors': errors,
+        'elapsed': elapsed,
+        'polled_at': time.time(),
+    }
+
+
+class LivePoller:
+    # Runs the asyncio polling loop on a daemon thread so the Streamlit
+    # script thread only ever reads the latest snapshot.
+
+    def __init__(self, meters, interval=1.0, max_concurrency=100, timeout=2.0):
+        self.interval = interval
+        self._poller = MeterPoller(meters, max_concurrency, timeout)
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='meter-poller', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.interval + self._poller.timeout + 1)
+
+    @property
+    def running(self):
+        # False once stopped, or if the polling loop died
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def latest(self):
+        with self._lock:
+            return self._snapshot
+
+    def _run(self):
+        asyncio.run(self._loop())
+
+    async def _loop(self):
+        try:
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                snapshot = await self._poller.poll()
+                with self._lock:
+                    self._snapshot = snapshot
+                await asyncio.sleep(max(0.0, self.interval - (time.perf_counter() - started)))
+        finally:
+            await self._poller.close()
+
+
+async def _load_test(meters, rounds, max_concurrency, timeout):
+    poller = MeterPoller(meters, max_concurrency, timeout)
+    try:
+        for k in range(rounds):
+            snapshot = await poller.poll()
+            ok = len(meters) - len(snapshot['errors'])
+            print(f"round {k + 1}: {ok}/{len(meters)} meters in {snapshot['elapsed'] * 1000:.0f} ms "
+                  f"({len(meters) / snapshot['elapsed']:,.0f} meters/s)")
+    finally:
+        await poller.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Poll meters over Modbus TCP and report round latency")
+    parser.add_argument('--meters', default='127.0.0.1:15020-15119', help="host:port[-port][:unit], comma separated")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--timeout', type=float, default=2.0)
+    args = parser.parse_args(argv)
+    asyncio.run(_load_test(parse_meters(args.meters), args.rounds, args.concurrency, args.timeout))
+
+
+if __name__ == '__main__':
+    main()
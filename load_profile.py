@@ -0,0 +1,141 @@
+import argparse
+import resource
+import time
+
+import numpy as np
+import pandas as pd
+
+from power_calc import calculate_power_energy_batch
+from quadrants import REGISTER_NAMES, classify_quadrant, register_columns
+from readings import from_fixed, to_fixed
+
+# --- Streaming ingestion of meter load-profile interval CSVs ---
+
+LOAD_PROFILE_COLUMNS = ['meter_id', 'timestamp', 'phase', 'voltage', 'current', 'angle_deg']
+NUMERIC_COLUMNS = ['voltage', 'current', 'angle_deg']
+# The readings are not given a dtype: the parser still reads clean chunks
+# straight to numbers, and a chunk with a stray "ERR" or "---" cell comes
+# back as text, converted in read_load_profile with that cell as NaN,
+# instead of a ValueError that stops the whole file
+LOAD_PROFILE_DTYPES = {'meter_id': str, 'timestamp': str, 'phase': str}
+ENERGY_COLUMNS = ['kWh', 'kVARh', 'kVAh']
+PHASES = ['R', 'Y', 'B']
+
+
+def read_load_profile(path, chunk_rows=500_000):
+    # Yields chunks with float64 readings, NaN where a cell is not a number;
+    # gzip/bz2/zip are picked from the file extension
+    reader = pd.read_csv(
+        path, usecols=LOAD_PROFILE_COLUMNS, dtype=LOAD_PROFILE_DTYPES,
+        chunksize=chunk_rows, compression='infer',
+    )
+    with reader:
+        for chunk in reader:
+            for name in NUMERIC_COLUMNS:
+                if chunk[name].dtype.kind not in 'biuf':
+                    chunk[name] = pd.to_numeric(chunk[name], errors='coerce')
+                chunk[name] = chunk[name].astype(np.float64)
+            yield chunk
+
+
+def validate_chunk(chunk):
+    # Unparseable readings arrive as NaN and fail the range checks below
+    valid = (
+        chunk['meter_id'].notna()
+        & chunk['timestamp'].notna()
+        & chunk['phase'].isin(PHASES)
+        & (chunk['voltage'] >= 0)
+        & (chunk['current'] >= 0)
+        & (chunk['angle_deg'] >= -180)
+        & (chunk['angle_deg'] <= 180)
+    )
+    return chunk[valid], int((~valid).sum())
+
+
+class LoadProfileAccumulator:
+    # Running kWh/kVARh/kVAh per (meter, phase); its size depends on the
+    # number of meters, never on the number of rows ingested. Totals are
+    # integer µWh (readings.to_fixed), so a year of intervals adds up
+    # exactly instead of drifting with float rounding.
+
+    def __init__(self, interval_minutes=15, registers=False):
+        self.hours = interval_minutes / 60
+        self.columns = ENERGY_COLUMNS + (REGISTER_NAMES if registers else [])
+        self.totals = None
+        self.rows = 0
+        self.rejected = 0
+        self.elapsed = 0.0
+
+    def add(self, chunk):
+        valid, rejected = validate_chunk(chunk)
+        self.rows += len(valid)
+        self.rejected += rejected
+
+        result = calculate_power_energy_batch(valid['voltage'], valid['current'], valid['angle_deg'], self.hours)
+        columns = {name: result[name] for name in ENERGY_COLUMNS}
+        if len(self.columns) > len(ENERGY_COLUMNS):
+            quadrant = classify_quadrant(valid['angle_deg'])
+            columns.update(register_columns(result['kWh'], result['kVARh'], quadrant))
+        energy = pd.DataFrame({name: to_fixed(values) for name, values in columns.items()}, index=valid.index)
+        energy['meter_id'] = valid['meter_id']
+        energy['phase'] = valid['phase']
+        grouped = energy.groupby(['meter_id', 'phase'], sort=False)[self.columns].sum()
+
+        if self.totals is None:
+            self.totals = grouped
+        else:
+            # concat + sum rather than add(fill_value=0), which goes through float
+            self.totals = pd.concat([self.totals, grouped]).groupby(level=[0, 1], sort=False).sum()
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        if self.totals is None:
+            return pd.DataFrame(columns=['Meter', 'Phase'] + self.columns)
+        per_phase = self.totals.reset_index().rename(columns={'meter_id': 'Meter', 'phase': 'Phase'})
+        total = per_phase.groupby('Meter', as_index=False)[self.columns].sum()
+        total['Phase'] = 'Total'
+        df = pd.concat([per_phase, total], ignore_index=True)
+        df[self.columns] = from_fixed(df[self.columns].to_numpy())
+        return sort_report(df[['Meter', 'Phase'] + self.columns])
+
+
+def sort_report(df):
+    # Meters in order, each with R, Y, B then its Total row
+    order = df['Phase'].map({'R': 0, 'Y': 1, 'B': 2, 'Total': 3})
+    df = df.assign(_order=order).sort_values(['Meter', '_order'], kind='stable')
+    return df.drop(columns='_order').reset_index(drop=True)
+
+
+def ingest_load_profile(paths, interval_minutes=15, chunk_rows=500_000, accumulator=None):
+    if isinstance(paths, str):
+        paths = [paths]
+    accumulator = accumulator or LoadProfileAccumulator(interval_minutes)
+    started = time.perf_counter()
+    for path in paths:
+        for chunk in read_load_profile(path, chunk_rows):
+            accumulator.add(chunk)
+    # Wall time includes parsing, which is where most of the time goes
+    accumulator.elapsed += time.perf_counter() - started
+    return accumulator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accumulate energy per meter and phase from load-profile CSVs")
+    parser.add_argument('paths', nargs='+', help="interval CSV files (.csv or .csv.gz)")
+    parser.add_argument('--interval', type=float, default=15, help="interval length in minutes")
+    parser.add_argument('--chunk-rows', type=int, default=500_000)
+    parser.add_argument('--output', default='energy_report.csv')
+    args = parser.parse_args(argv)
+
+    acc = ingest_load_profile(args.paths, args.interval, args.chunk_rows)
+    acc.report().to_csv(args.output, index=False)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{acc.rows} rows ({acc.rejected} rejected) in {acc.elapsed:.2f} s, "
+          f"{acc.rows_per_second:,.0f} rows/s, peak RSS {peak_mb:.0f} MB -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
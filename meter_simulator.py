@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import struct
+
+import numpy as np
+
+from live_polling import READ_HOLDING_REGISTERS, REGISTER_COUNT, REGISTER_MAP, REGISTER_START
+
+# --- Local Modbus TCP meter simulator for load-testing the live mode ---
+
+
+class SimulatedMeter:
+    # Random-walk V/I/angle around a nominal 230 V three-phase load
+
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed)
+        self.values = np.array([230.0] * 3 + [self.rng.uniform(5, 100)] * 3 + [self.rng.uniform(-30, 60)] * 3)
+
+    def registers(self):
+        step = self.rng.normal(0, [0.5] * 3 + [0.5] * 3 + [1.0] * 3)
+        self.values = self.values + step
+        self.values[3:6] = np.maximum(self.values[3:6], 0.0)
+        self.values[6:9] = (self.values[6:9] + 180) % 360 - 180
+        return struct.pack(f'>{len(REGISTER_MAP)}f', *self.values)
+
+
+async def serve_meter(reader, writer, meter, latency):
+    try:
+        while True:
+            header = await reader.readexactly(7)
+            transaction, protocol, length, unit = struct.unpack('>HHHB', header)
+            pdu = await reader.readexactly(length - 1)
+            function, start, count = struct.unpack('>BHH', pdu[:5])
+            if latency:
+                await asyncio.sleep(latency)
+            if function != READ_HOLDING_REGISTERS:
+                reply = struct.pack('>BB', function | 0x80, 1)  # illegal function
+            elif start != REGISTER_START or count != REGISTER_COUNT:
+                reply = struct.pack('>BB', function | 0x80, 2)  # illegal data address
+            else:
+                data = meter.registers()
+                reply = struct.pack('>BB', function, len(data)) + data
+            writer.write(struct.pack('>HHHB', transaction, protocol, len(reply) + 1, unit) + reply)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_simulator(host, base_port, count, latency):
+    # One listening port per meter, like a fleet of meters with their own IPs
+    servers = []
+    for k in range(count):
+        meter = SimulatedMeter(seed=k)
+        handler = lambda r, w, meter=meter: serve_meter(r, w, meter, latency)
+        servers.append(await asyncio.start_server(handler, host, base_port + k))
+    print(f"simulating {count} meters on {host}:{base_port}-{base_port + count - 1}", flush=True)
+    await asyncio.gather(*(server.serve_forever() for server in servers))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve simulated three-phase meters over Modbus TCP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=15020, help="port of the first meter")
+    parser.add_argument('--count', type=int, default=100, help="number of meters (one port each)")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds of simulated response delay")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_simulator(args.host, args.port, args.count, args.latency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
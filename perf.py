@@ -0,0 +1,199 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# --- Cold-start, per-rerun and per-stage timing for the Streamlit apps ---
+
+# Process-wide, so the first run of any page in this server is the cold start
+_stats = {'cold_start': None, 'reruns': 0}
+
+# Seconds; Prometheus client defaults with a 1 ms bucket in front
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path to rewrite with the Prometheus text after every rerun, e.g. for
+# node_exporter's textfile collector
+METRICS_FILE_ENV = 'ANALYZER_METRICS_FILE'
+# Shows the debug panel on every page; ?debug=1 does the same per session
+DEBUG_ENV = 'ANALYZER_DEBUG'
+
+# Streamlit runs each session's script on its own thread
+_local = threading.local()
+
+
+class MetricsRegistry:
+    # Counters and histograms shared by every session in this process
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels=None, value=1):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            counts, total, n = self._histograms.get(key, ((0,) * len(self.buckets), 0.0, 0))
+            counts = tuple(c + (value <= bound) for c, bound in zip(counts, self.buckets))
+            self._histograms[key] = (counts, total + value, n + 1)
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def prometheus_text(self, extra_counters=()):
+        # extra_counters: (name, labels, value) read from elsewhere at export time
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = sorted(self._histograms.items())
+        for name, labels, value in extra_counters:
+            counters[(name, tuple(sorted(labels.items())))] = value
+
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f'# TYPE {name} counter')
+            lines += [f'{name}{_labels(labels)} {value}' for (n, labels), value in sorted(counters.items())
+                      if n == name]
+        for name in sorted({name for (name, _), _ in histograms}):
+            lines.append(f'# TYPE {name} histogram')
+            for (n, labels), (counts, total, count) in histograms:
+                if n != name:
+                    continue
+                for bound, c in zip(self.buckets, counts):
+                    lines.append(f'{name}_bucket{_labels(labels + (("le", f"{bound:g}"),))} {c}')
+                lines.append(f'{name}_bucket{_labels(labels + (("le", "+Inf"),))} {count}')
+                lines.append(f'{name}_sum{_labels(labels)} {total:.6f}')
+                lines.append(f'{name}_count{_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path, extra_counters=()):
+        # A private tmp file per writer, so sessions exporting at once never
+        # share one; os.replace then publishes a complete file
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path) or '.',
+                                         suffix='.tmp', delete=False) as f:
+            f.write(self.prometheus_text(extra_counters))
+        os.replace(f.name, path)
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+metrics = MetricsRegistry()
+
+
+def cache_counters():
+    # The shared caches (figures included) keep their own hit/miss counts;
+    # read them at export. "wait" counts sessions that waited on another
+    # session's computation.
+    import figure_cache  # noqa: F401, registers the figure cache
+    from shared_cache import caches
+
+    counters = []
+    for name, cache in sorted(caches.items()):
+        for result, value in (('hit', cache.hits), ('miss', cache.misses), ('wait', cache.waits)):
+            counters.append(('analyzer_shared_cache_total', {'cache': name, 'result': result}, value))
+    return counters
+
+
+@contextmanager
+def stage(name):
+    # Times a block for the current rerun's breakdown and the stage histogram.
+    # Nested stages are recorded by path, e.g. "compute/render".
+    stack = _local.__dict__.setdefault('stages', [])
+    stack.append(name)
+    path = '/'.join(stack)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stack.pop()
+        timer = getattr(_local, 'timer', None)
+        page = timer.page if timer is not None else 'none'
+        if timer is not None:
+            timer.stages.append((path, elapsed))
+        metrics.observe('analyzer_stage_seconds', elapsed, {'page': page, 'stage': path})
+
+
+def _debug_enabled(st):
+    return os.environ.get(DEBUG_ENV) == '1' or st.query_params.get('debug') == '1'
+
+
+class RerunTimer:
+
+    def __init__(self, page=None):
+        import streamlit as st
+
+        # Page label for metrics: the calling script's file name by default
+        self.page = page or os.path.splitext(os.path.basename(sys._getframe(1).f_code.co_filename))[0]
+        self.stages = []
+        self.profiler = None
+        _local.timer = self
+        _local.stages = []
+        if st.session_state.pop('perf_profile_next', False):
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.started = time.perf_counter()
+
+    def report(self):
+        import streamlit as st
+
+        elapsed = time.perf_counter() - self.started
+        if self.profiler is not None:
+            self.profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats('cumulative').print_stats(30)
+            st.session_state['perf_profile'] = out.getvalue()
+        if _stats['cold_start'] is None:
+            _stats['cold_start'] = elapsed
+        _stats['reruns'] += 1
+        metrics.inc('analyzer_reruns_total', {'page': self.page})
+        metrics.observe('analyzer_rerun_seconds', elapsed, {'page': self.page})
+        _local.timer = None
+
+        path = os.environ.get(METRICS_FILE_ENV)
+        if path:
+            metrics.write(path, cache_counters())
+
+        st.caption(f"⏱ Rerun {elapsed * 1000:.0f} ms · cold start {_stats['cold_start'] * 1000:.0f} ms "
+                   f"· {_stats['reruns']} reruns in this process")
+        if _debug_enabled(st):
+            self.debug_panel(elapsed)
+        return elapsed
+
+    def debug_panel(self, elapsed):
+        import streamlit as st
+
+        with st.expander("🛠 Performance details"):
+            if self.stages:
+                st.dataframe({'Stage': [name for name, _ in self.stages],
+                              'ms': [round(seconds * 1000, 2) for _, seconds in self.stages]},
+                             width='stretch', hide_index=True)
+                top = sum(seconds for name, seconds in self.stages if '/' not in name)
+                st.caption(f"{top * 1000:.0f} ms in timed stages, {(elapsed - top) * 1000:.0f} ms elsewhere")
+            else:
+                st.caption("No timed stages ran in this rerun.")
+
+            if st.button("Profile the next rerun"):
+                st.session_state['perf_profile_next'] = True
+                st.caption("cProfile will run during your next interaction with the page.")
+            if 'perf_profile' in st.session_state:
+                st.code(st.session_state['perf_profile'], language=None)
+
+            text = metrics.prometheus_text(cache_counters())
+            st.download_button("Download metrics (Prometheus text)", data=text, file_name='analyzer_metrics.prom',
+                               mime='text/plain')
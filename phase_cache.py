@@ -0,0 +1,51 @@
+import math
+
+import streamlit as st
+
+from perf import metrics, stage
+from shared_cache import make_key
+
+# --- Per-phase results kept in session state, recomputed only on change ---
+
+
+def cached_phase(phase, inputs, compute):
+    # compute() runs only when this phase's own inputs differ from last time
+    store = st.session_state.setdefault('phase_cache', {})
+    key = make_key(inputs)
+    entry = store.get(phase)
+    if entry is None or entry[0] != key:
+        metrics.inc('analyzer_phase_cache_total', {'result': 'miss'})
+        with stage('compute'):
+            entry = (key, compute())
+        store[phase] = entry
+    else:
+        metrics.inc('analyzer_phase_cache_total', {'result': 'hit'})
+    st.session_state.setdefault('phase_shown', {})[phase] = key
+    return entry[1]
+
+
+def clear_shown_phases():
+    # Call before the input fragments on every full run: a full run redraws
+    # (or drops) the results, so only fragment reruns can leave them stale
+    st.session_state['phase_shown'] = {}
+
+
+def phase_input_error(V, I):
+    # RMS values are magnitudes; None is a cleared number_input
+    for label, value in (('voltage', V), ('current', I)):
+        if value is None or not math.isfinite(value) or value < 0:
+            return f"{label} must be a number of at least 0"
+    return None
+
+
+def phase_input_status(phase, inputs):
+    # Shown inside an input fragment, which reruns without the results below
+    # it: flag invalid inputs, and results that no longer match the inputs
+    error = phase_input_error(*inputs[:2])
+    if error:
+        st.error(f"{phase} phase: {error}")
+        return error
+    shown = st.session_state.get('phase_shown', {}).get(phase)
+    if shown is not None and shown != make_key(inputs):
+        st.warning(f"{phase} phase inputs changed; press Calculate to update its results.")
+    return None
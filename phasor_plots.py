@@ -0,0 +1,121 @@
+import numpy as np
+
+from decimate import plot_decimated
+
+# --- Phasor and waveform plots for the calculator apps ---
+#
+# matplotlib is imported inside each function, so importing this module
+# keeps it off the apps' cold start. The single-phase plots take an optional
+# phase name, as app30 draws one set per phase.
+
+
+def plot_single_phase_vectors(v_rms, i_rms, angle_deg, phase=None):
+    import matplotlib.pyplot as plt  # loaded on the first plot, not at cold start
+    angle_rad = np.radians(angle_deg)
+    Vx, Vy = v_rms, 0
+    Ix = i_rms * np.cos(angle_rad)
+    Iy = i_rms * np.sin(angle_rad)
+
+    fig, ax = plt.subplots()
+    prefix = f'{phase} ' if phase else ''
+    ax.quiver(0, 0, Vx, Vy, angles='xy', scale_units='xy', scale=1, color='blue', label=f'{prefix}Voltage')
+    ax.quiver(0, 0, Ix, Iy, angles='xy', scale_units='xy', scale=1, color='red', label=f'{prefix}Current')
+    ax.set_xlim(-max(v_rms, i_rms)-10, max(v_rms, i_rms)+10)
+    ax.set_ylim(-max(v_rms, i_rms)-10, max(v_rms, i_rms)+10)
+    ax.set_aspect('equal')
+    ax.grid(True)
+    ax.legend()
+    ax.set_title(f'{phase} Phase Voltage and Current Vectors' if phase else 'Voltage and Current Vectors')
+    return fig
+
+def plot_single_phase_waveforms(Vrms, Irms, angle_rad, time_vector, phase=None):
+    import matplotlib.pyplot as plt
+    omega = 2 * np.pi * 50  # 50 Hz means angular frequency
+    # Convert RMS to peak values
+    Vpeak = Vrms * np.sqrt(2)
+    Ipeak = Irms * np.sqrt(2)
+    
+    # Create waveforms using peak values
+    v_t = Vpeak * np.sin(omega * time_vector)  # Voltage waveform (using peak value)
+    i_t = Ipeak * np.sin(omega * time_vector + angle_rad)  # Current waveform (using peak value)
+    p_t = v_t * i_t  # Instantaneous power
+
+    fig, ax = plt.subplots(3, 1, figsize=(10, 6), sharex=True)
+    if phase:
+        # One set per phase: each panel is titled with the phase instead of a legend
+        plot_decimated(ax[0], time_vector, v_t, color='blue')
+        ax[0].set_title(f'{phase} Phase Voltage')
+        plot_decimated(ax[1], time_vector, i_t, color='red')
+        ax[1].set_title(f'{phase} Phase Current')
+        plot_decimated(ax[2], time_vector, p_t, color='green')
+        ax[2].set_title(f'{phase} Phase Instantaneous Power')
+    else:
+        plot_decimated(ax[0], time_vector, v_t, label='Voltage', color='blue')
+        ax[0].legend()
+        plot_decimated(ax[1], time_vector, i_t, label='Current', color='red')
+        ax[1].legend()
+        plot_decimated(ax[2], time_vector, p_t, label='Power (W)', color='green')
+        ax[2].legend()
+    ax[0].set_ylabel('Voltage (V)')
+    ax[1].set_ylabel('Current (A)')
+    ax[2].set_ylabel('Power (W)')
+    ax[2].set_xlabel('Time (s)')
+    return fig
+
+
+def plot_three_phase_vectors(Vrms_list, Irms_list, current_angles_deg):
+    import matplotlib.pyplot as plt  # loaded on the first plot, not at cold start
+    fig, ax = plt.subplots(figsize=(8,8))
+    
+    voltage_angles_deg = [0, -120, 120]  # Fixed voltage angles
+    colors = ['red', 'gold', 'blue']
+    labels = ['Phase R', 'Phase Y', 'Phase B']
+
+    # Plot voltage vectors (solid line arrows)
+    for i in range(3):
+        Vx = Vrms_list[i] * np.cos(np.radians(voltage_angles_deg[i]))
+        Vy = Vrms_list[i] * np.sin(np.radians(voltage_angles_deg[i]))
+        ax.arrow(0, 0, Vx, Vy, head_width=15, head_length=15, fc=colors[i], ec=colors[i], label=f'Voltage {labels[i]}')
+
+    # Plot current vectors (dashed line simulation)
+    for i in range(3):
+        angle = voltage_angles_deg[i] - current_angles_deg[i]
+        Ix = Irms_list[i] * np.cos(np.radians(angle))
+        Iy = Irms_list[i] * np.sin(np.radians(angle))
+        # Dashed current arrow
+        ax.plot([0, Ix], [0, Iy], color=colors[i], linestyle='dashed', label=f'Current {labels[i]}')
+
+    ax.set_xlim(-300, 300)
+    ax.set_ylim(-300, 300)
+    ax.set_aspect('equal')
+    ax.grid(True)
+    ax.legend()
+    ax.set_title('Voltage and Current Vectors')
+    return fig
+
+def plot_three_phase_waveforms(Vrms_list, Irms_list, current_angles_deg, time_vector):
+    import matplotlib.pyplot as plt
+    omega = 2 * np.pi * 50  # 50Hz
+    voltage_angles_deg = [0, -120, 120]  # Voltage fixed
+    
+    colors = ['red', 'gold', 'blue']
+    labels = ['R', 'Y', 'B']
+    
+    fig, ax = plt.subplots(figsize=(10,6))
+
+    for i in range(3):
+        Vpeak = Vrms_list[i] * np.sqrt(2)
+        Ipeak = Irms_list[i] * np.sqrt(2)
+        
+        v_wave = Vpeak * np.sin(omega * time_vector + np.radians(voltage_angles_deg[i]))
+        i_wave = Ipeak * np.sin(omega * time_vector + np.radians(voltage_angles_deg[i] - current_angles_deg[i]))
+        
+        plot_decimated(ax, time_vector, v_wave, color=colors[i], label=f'V{labels[i]}', linestyle='solid')
+        plot_decimated(ax, time_vector, i_wave, color=colors[i], label=f'I{labels[i]}', linestyle='dashed')
+
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Amplitude')
+    ax.set_title('Voltage and Current Waveforms')
+    ax.grid(True)
+    ax.legend()
+    return fig
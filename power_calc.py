@@ -0,0 +1,45 @@
+import numpy as np
+
+# --- Power and energy core shared by the Streamlit apps and bulk jobs ---
+
+POWER_COLUMNS = ['kW', 'kVAR', 'kVA', 'kWh', 'kVARh', 'kVAh']
+
+
+def _column(data, *names):
+    for name in names:
+        if name in data:
+            return data[name]
+    raise KeyError(f"missing column, expected one of {names}")
+
+
+def calculate_power_energy_batch(V, I=None, angle_deg=None, hours=None):
+    # Accept a DataFrame (or any mapping of columns) as the first argument
+    if I is None and angle_deg is None and hours is None:
+        frame = V
+        V = _column(frame, 'V', 'voltage')
+        I = _column(frame, 'I', 'current')
+        angle_deg = _column(frame, 'angle_deg', 'angle')
+        hours = _column(frame, 'hours')
+
+    V = np.asarray(V, dtype=np.float64)
+    I = np.asarray(I, dtype=np.float64)
+    angle_rad = np.radians(np.asarray(angle_deg, dtype=np.float64))
+    hours = np.asarray(hours, dtype=np.float64)
+
+    # Same operation order as the scalar formula so both paths round alike
+    S = V * I
+    P = S * np.cos(angle_rad)
+    Q = S * np.sin(angle_rad)
+    return {
+        'kW': P / 1000,
+        'kVAR': Q / 1000,
+        'kVA': S / 1000,
+        'kWh': P * hours / 1000,
+        'kVARh': Q * hours / 1000,
+        'kVAh': S * hours / 1000
+    }
+
+
+def calculate_power_energy(V, I, angle_deg, hours):
+    result = calculate_power_energy_batch(V, I, angle_deg, hours)
+    return {name: round(float(result[name]), 3) for name in POWER_COLUMNS}
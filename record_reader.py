@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+
+# --- Memory-mapped readers for large waveform / disturbance records ---
+
+COMTRADE_FORMATS = {'BINARY': '<i2', 'BINARY32': '<i4', 'FLOAT32': '<f4'}
+
+
+class Channel:
+    # Zero-copy view of one channel; scaling is applied only to the slice
+    # that is actually read, so the full channel is never materialized.
+
+    def __init__(self, name, raw, scale=1.0, offset=0.0, unit='', phase=''):
+        self.name = name
+        self.raw = raw
+        self.scale = scale
+        self.offset = offset
+        self.unit = unit
+        self.phase = phase
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __getitem__(self, index):
+        values = self.raw[index].astype(np.float64)
+        values *= self.scale
+        values += self.offset
+        return values
+
+
+class WaveformRecord:
+    # Common time-slicing and chunking on top of a set of channels
+
+    def __init__(self, channels, sample_rate, start_time=0.0):
+        self.channels = {ch.name: ch for ch in channels}
+        self.sample_rate = float(sample_rate)
+        self.start_time = start_time
+        self.n_samples = len(channels[0]) if channels else 0
+
+    @property
+    def duration(self):
+        return self.n_samples / self.sample_rate
+
+    def __getitem__(self, name):
+        return self.channels[name]
+
+    def time_slice(self, t0=None, t1=None):
+        start = 0 if t0 is None else int(np.ceil((t0 - self.start_time) * self.sample_rate))
+        stop = self.n_samples if t1 is None else int(np.floor((t1 - self.start_time) * self.sample_rate)) + 1
+        return slice(max(start, 0), min(max(stop, 0), self.n_samples))
+
+    def time(self, t0=None, t1=None, step=1):
+        sl = self.time_slice(t0, t1)
+        return self.start_time + np.arange(sl.start, sl.stop, step) / self.sample_rate
+
+    def channel(self, name, t0=None, t1=None, step=1):
+        sl = self.time_slice(t0, t1)
+        return self.channels[name][sl.start:sl.stop:step]
+
+    def iter_chunks(self, v_names, i_names, chunk_samples=1 << 20, t0=None, t1=None):
+        # Yields (v, i) as (n, phases) arrays ready for StreamingPowerAnalyzer
+        sl = self.time_slice(t0, t1)
+        v_channels = [self.channels[name] for name in v_names]
+        i_channels = [self.channels[name] for name in i_names]
+        for start in range(sl.start, sl.stop, chunk_samples):
+            stop = min(start + chunk_samples, sl.stop)
+            v = np.column_stack([ch[start:stop] for ch in v_channels])
+            i = np.column_stack([ch[start:stop] for ch in i_channels])
+            yield v, i
+
+
+class RawRecord(WaveformRecord):
+    # Plain interleaved int16 samples: ch0, ch1, ..., chN, ch0, ...
+
+    def __init__(self, path, n_channels, sample_rate, names=None, scales=None, offsets=None,
+                 dtype='<i2', header_bytes=0):
+        names = names or [f'ch{k}' for k in range(n_channels)]
+        scales = scales if scales is not None else [1.0] * n_channels
+        offsets = offsets if offsets is not None else [0.0] * n_channels
+        itemsize = np.dtype(dtype).itemsize
+        n_samples = (os.path.getsize(path) - header_bytes) // (itemsize * n_channels)
+        self.data = np.memmap(path, dtype=dtype, mode='r', offset=header_bytes, shape=(n_samples, n_channels))
+        channels = [Channel(names[k], self.data[:, k], scales[k], offsets[k]) for k in range(n_channels)]
+        super().__init__(channels, sample_rate)
+
+
+class ComtradeRecord(WaveformRecord):
+    # COMTRADE .cfg/.dat pair with a binary data file and one sampling rate
+
+    def __init__(self, cfg_path, dat_path=None):
+        dat_path = dat_path or os.path.splitext(cfg_path)[0] + '.dat'
+        cfg = parse_comtrade_cfg(cfg_path)
+        if cfg['format'] not in COMTRADE_FORMATS:
+            raise ValueError(f"{cfg['format']} COMTRADE data cannot be memory-mapped, convert it to BINARY first")
+        if len(cfg['rates']) > 1:
+            raise ValueError("multi-rate COMTRADE records are not supported")
+
+        sample_type = COMTRADE_FORMATS[cfg['format']]
+        fields = [('n', '<u4'), ('t', '<u4')]
+        fields += [(f'a{k}', sample_type) for k in range(len(cfg['analog']))]
+        fields += [(f'd{k}', '<u2') for k in range((cfg['n_digital'] + 15) // 16)]
+        self.data = np.memmap(dat_path, dtype=np.dtype(fields), mode='r')
+
+        channels = [
+            Channel(a['name'], self.data[f'a{k}'], a['scale'], a['offset'], a['unit'], a['phase'])
+            for k, a in enumerate(cfg['analog'])
+        ]
+        self.station = cfg['station']
+        self.line_frequency = cfg['frequency']
+        if cfg['rates'] and cfg['rates'][0][0] > 0:
+            sample_rate = cfg['rates'][0][0]
+        else:
+            # Rate 0 means "use the timestamps"; assume they are evenly spaced
+            step = (float(self.data['t'][1]) - float(self.data['t'][0])) * cfg['timemult'] * 1e-6
+            sample_rate = 1.0 / step
+        super().__init__(channels, sample_rate)
+
+
+def parse_comtrade_cfg(path):
+    with open(path, encoding='latin-1') as f:
+        lines = [line.strip() for line in f if line.strip()]
+
+    station = lines[0].split(',')[0]
+    counts = lines[1].split(',')
+    n_analog = int(counts[1].strip().rstrip('Aa'))
+    n_digital = int(counts[2].strip().rstrip('Dd'))
+
+    analog = []
+    for line in lines[2:2 + n_analog]:
+        parts = [p.strip() for p in line.split(',')]
+        analog.append({
+            'name': parts[1], 'phase': parts[2], 'unit': parts[4],
+            'scale': float(parts[5]), 'offset': float(parts[6]),
+        })
+
+    pos = 2 + n_analog + n_digital
+    frequency = float(lines[pos])
+    n_rates = int(lines[pos + 1])
+    # nrates == 0 still carries one "0,endsamp" line meaning timestamped samples
+    rates = []
+    for line in lines[pos + 2:pos + 2 + max(n_rates, 1)]:
+        samp, endsamp = line.split(',')[:2]
+        rates.append((float(samp), int(endsamp)))
+    pos += 2 + max(n_rates, 1)
+
+    # Start and trigger timestamps, then the data file type and time multiplier
+    fmt = lines[pos + 2].upper() if len(lines) > pos + 2 else 'ASCII'
+    timemult = float(lines[pos + 3]) if len(lines) > pos + 3 else 1.0
+    return {
+        'station': station, 'analog': analog, 'n_digital': n_digital,
+        'frequency': frequency, 'rates': rates, 'format': fmt, 'timemult': timemult,
+    }
+
+
+def open_record(path, **kwargs):
+    if path.lower().endswith('.cfg'):
+        return ComtradeRecord(path, **kwargs)
+    return RawRecord(path, **kwargs)
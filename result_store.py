@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from load_profile import PHASES, read_load_profile, validate_chunk
+from power_calc import POWER_COLUMNS, calculate_power_energy_batch
+from quadrants import classify_quadrant
+
+# --- Columnar store of computed interval results, one partition per day ---
+#
+# root/meters.json                    meter IDs; a meter's code is its position
+# root/date=YYYY-MM-DD/seg-N/*.npy    one file per column, rows sorted by
+#                                     (meter code, timestamp, phase)
+# root/date=.../seg-N/offsets.npy     row range of each meter code in that segment
+#
+# Each append writes one new segment into each day it touches; segments
+# already on disk are never read back or rewritten, so ingest cost grows
+# with the rows appended, not with what the store already holds. A query
+# reads each segment's offsets, then seeks straight to one meter's rows in
+# each column file, so it never scans other meters. When segments repeat a
+# (timestamp, phase) for a meter, the later segment wins.
+
+KEY_COLUMNS = ['meter', 'timestamp', 'phase']
+VALUE_COLUMNS = ['V', 'I', 'angle_deg'] + POWER_COLUMNS + ['quadrant']
+COLUMN_DTYPES = {'meter': np.int32, 'timestamp': 'datetime64[m]', 'phase': np.int8, 'quadrant': np.int8}
+
+
+def interval_results(chunk, interval_minutes=15):
+    # Load-profile rows -> per-interval power/energy/quadrant columns
+    valid, rejected = validate_chunk(chunk)
+    result = calculate_power_energy_batch(valid['voltage'], valid['current'], valid['angle_deg'],
+                                          interval_minutes / 60)
+    columns = {
+        'meter_id': valid['meter_id'].to_numpy(),
+        'timestamp': valid['timestamp'].to_numpy().astype('datetime64[m]'),
+        'phase': valid['phase'].map({p: k for k, p in enumerate(PHASES)}).to_numpy(np.int8),
+        'V': valid['voltage'].to_numpy(),
+        'I': valid['current'].to_numpy(),
+        'angle_deg': valid['angle_deg'].to_numpy(),
+        'quadrant': classify_quadrant(valid['angle_deg']),
+    }
+    columns.update({name: np.asarray(result[name]) for name in POWER_COLUMNS})
+    return columns, rejected
+
+
+def _partition_name(day):
+    return f'date={day}'
+
+
+def _segment_number(name):
+    # 'seg-000012' -> 12; anything else (e.g. an unfinished '.tmp') -> None
+    if name.startswith('seg-') and name[len('seg-'):].isdigit():
+        return int(name[len('seg-'):])
+    return None
+
+
+def _keep_last(key):
+    # key columns already sorted stably; True for the newest row of each run
+    n = len(key[0])
+    last = np.ones(n, dtype=bool)
+    if n > 1:
+        same = np.ones(n - 1, dtype=bool)
+        for values in key:
+            same &= values[1:] == values[:-1]
+        last[:-1] = ~same
+    return last
+
+
+def _read_rows(path, a, b):
+    # Rows a..b of a 1-D .npy file: parse the header, seek, read just those
+    with open(path, 'rb') as f:
+        if np.lib.format.read_magic(f) == (1, 0):
+            _, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            _, _, dtype = np.lib.format.read_array_header_2_0(f)
+        f.seek(a * dtype.itemsize, os.SEEK_CUR)
+        return np.fromfile(f, dtype=dtype, count=b - a)
+
+
+class ResultStore:
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._meters_path = os.path.join(root, 'meters.json')
+        self.meters = []
+        if os.path.exists(self._meters_path):
+            with open(self._meters_path, encoding='utf-8') as f:
+                self.meters = json.load(f)
+        self._codes = {m: k for k, m in enumerate(self.meters)}
+
+    def days(self):
+        names = sorted(n for n in os.listdir(self.root) if n.startswith('date='))
+        return [np.datetime64(n[len('date='):], 'D') for n in names]
+
+    def _meter_codes(self, meter_ids):
+        # New meters get the next codes; the list itself is append-only
+        unique, inverse = np.unique(np.asarray(meter_ids, dtype=str), return_inverse=True)
+        new = [m for m in unique.tolist() if m not in self._codes]
+        if new:
+            for m in new:
+                self._codes[m] = len(self.meters)
+                self.meters.append(m)
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.root, suffix='.tmp',
+                                             delete=False) as f:
+                json.dump(self.meters, f)
+            os.replace(f.name, self._meters_path)
+        return np.array([self._codes[m] for m in unique.tolist()], dtype=np.int32)[inverse]
+
+    def append(self, columns):
+        # columns: meter_id, timestamp, phase plus VALUE_COLUMNS arrays
+        columns = dict(columns)
+        columns['meter'] = self._meter_codes(columns.pop('meter_id'))
+        columns['timestamp'] = np.asarray(columns['timestamp'], dtype='datetime64[m]')
+        day = columns['timestamp'].astype('datetime64[D]')
+        for d in np.unique(day):
+            rows = day == d
+            self._write_partition(d, {name: np.asarray(values)[rows] for name, values in columns.items()})
+
+    def _segments(self, day):
+        # Finished segment folders of a day, oldest first
+        folder = os.path.join(self.root, _partition_name(day))
+        if not os.path.isdir(folder):
+            return []
+        numbered = sorted((_segment_number(n), n) for n in os.listdir(folder) if _segment_number(n) is not None)
+        return [os.path.join(folder, n) for _, n in numbered]
+
+    def _write_partition(self, day, columns):
+        # One new segment per call; earlier segments of the day are left alone
+        folder = os.path.join(self.root, _partition_name(day))
+        os.makedirs(folder, exist_ok=True)
+        numbers = [_segment_number(n) for n in os.listdir(folder)]
+        number = max([k for k in numbers if k is not None], default=0) + 1
+
+        order = np.lexsort((columns['phase'], columns['timestamp'], columns['meter']))
+        # Within one append, later rows win on duplicate keys
+        order = order[_keep_last([columns[name][order] for name in KEY_COLUMNS])]
+
+        segment = os.path.join(folder, f'seg-{number:06d}')
+        tmp = segment + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for name in KEY_COLUMNS + VALUE_COLUMNS:
+            values = np.asarray(columns[name])[order].astype(COLUMN_DTYPES.get(name, np.float64))
+            np.save(os.path.join(tmp, f'{name}.npy'), values)
+        meter = columns['meter'][order]
+        offsets = np.searchsorted(meter, np.arange(len(self.meters) + 1)).astype(np.int64)
+        np.save(os.path.join(tmp, 'offsets.npy'), offsets)
+        os.replace(tmp, segment)
+
+    def read(self, meter_id, start=None, end=None, columns=None):
+        # Rows of one meter with start <= timestamp < end, as column arrays
+        columns = columns or VALUE_COLUMNS
+        names = ['timestamp', 'phase'] + [c for c in columns if c not in ('timestamp', 'phase')]
+        parts = {name: [] for name in names}
+        code = self._codes.get(meter_id)
+        if code is not None:
+            start = None if start is None else np.datetime64(start, 'm')
+            end = None if end is None else np.datetime64(end, 'm')
+            for day in self.days():
+                if (start is not None and day + 1 <= start) or (end is not None and day >= end):
+                    continue
+                self._read_meter_rows(day, code, start, end, parts)
+        return {name: (np.concatenate(values) if values else
+                       np.empty(0, dtype=COLUMN_DTYPES.get(name, np.float64)))
+                for name, values in parts.items()}
+
+    def _read_meter_rows(self, day, code, start, end, parts):
+        found = {name: [] for name in parts}
+        for folder in self._segments(day):
+            offsets = _read_rows(os.path.join(folder, 'offsets.npy'), code, code + 2)
+            if len(offsets) < 2 or offsets[0] == offsets[1]:
+                continue  # no rows, or meter first seen after this segment was written
+            a, b = int(offsets[0]), int(offsets[1])
+            timestamps = _read_rows(os.path.join(folder, 'timestamp.npy'), a, b)
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start))
+            hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end))
+            for name in found:
+                if name == 'timestamp':
+                    found[name].append(timestamps[lo:hi])
+                else:
+                    found[name].append(_read_rows(os.path.join(folder, f'{name}.npy'), a + lo, a + hi))
+        if len(found['timestamp']) > 1:
+            # Interleave the segments; a stable sort keeps them oldest first
+            # within a key, so the last of each run is the newest
+            merged = {name: np.concatenate(values) for name, values in found.items()}
+            order = np.lexsort((merged['phase'], merged['timestamp']))
+            order = order[_keep_last([merged['timestamp'][order], merged['phase'][order]])]
+            found = {name: [values[order]] for name, values in merged.items()}
+        for name, values in found.items():
+            parts[name].extend(values)
+
+    def history(self, meter_id, start=None, end=None, columns=None):
+        import pandas as pd
+
+        data = self.read(meter_id, start, end, columns)
+        df = pd.DataFrame(data)
+        df['phase'] = np.array(PHASES)[df['phase'].to_numpy()]
+        return df
+
+
+def ingest(store, paths, interval_minutes=15, chunk_rows=500_000):
+    # Each chunk is written as new segments of the days it covers as soon as
+    # it is read, so memory stays at one chunk whatever the file size
+    rows = rejected = 0
+    for path in paths:
+        for chunk in read_load_profile(path, chunk_rows):
+            columns, bad = interval_results(chunk, interval_minutes)
+            rejected += bad
+            if len(columns['meter_id']):
+                store.append(columns)
+                rows += len(columns['meter_id'])
+    return rows, rejected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store computed interval results and query one meter's history")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('ingest', help="compute and append load-profile CSVs")
+    p.add_argument('root')
+    p.add_argument('paths', nargs='+')
+    p.add_argument('--interval', type=float, default=15, help="interval length in minutes")
+    p.add_argument('--chunk-rows', type=int, default=500_000, help="CSV rows read and stored at a time")
+    q = sub.add_parser('query', help="print a meter's rows in a time range")
+    q.add_argument('root')
+    q.add_argument('meter_id')
+    q.add_argument('--start')
+    q.add_argument('--end')
+    q.add_argument('--output', help="write CSV instead of printing")
+    args = parser.parse_args(argv)
+
+    store = ResultStore(args.root)
+    started = time.perf_counter()
+    if args.command == 'ingest':
+        rows, rejected = ingest(store, args.paths, args.interval, args.chunk_rows)
+        print(f"{rows} rows ({rejected} rejected) appended in {time.perf_counter() - started:.2f} s")
+    else:
+        df = store.history(args.meter_id, args.start, args.end)
+        elapsed = time.perf_counter() - started
+        if args.output:
+            df.to_csv(args.output, index=False)
+        else:
+            print(df.to_string(index=False))
+        print(f"{len(df)} rows in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from load_profile import PHASES, read_load_profile, validate_chunk
+from sequence import three_phase_phasors, unbalance_excursions, unbalance_factors
+
+# --- Vectorized data-quality and tamper screening of load-profile readings ---
+
+CHECKS = {
+    'reverse_power': "negative active power on an import-only meter (CT reversed?)",
+    'missing_potential': "near-zero phase voltage while current flows (potential link removed?)",
+    'phase_sequence': "current phasors out of sequence with the 0/-120/120° voltages (phases swapped?)",
+    'timestamp_gap': "missing intervals in the load profile",
+    'duplicate_timestamp': "the same interval recorded more than once",
+    'stuck_voltage': "voltage reading frozen at one value",
+    'stuck_current': "current reading frozen at one value",
+}
+FLAG_COLUMNS = ['meter_id', 'check', 'phase', 'intervals', 'first', 'last', 'reason']
+
+MISSING_POTENTIAL_V = 23.0  # 10 % of 230 V nominal
+MIN_CURRENT = 0.1  # A; below this a phase counts as unloaded
+SEQUENCE_FACTOR = 1.0  # |I2| / |I1| above this means negative sequence dominates
+SEQUENCE_INTERVALS = 4  # consecutive intervals, so heavy unbalance alone is not flagged
+STUCK_INTERVALS = 8  # identical consecutive readings before a value counts as stuck
+
+
+def _flags(check, meter_ids, phase, counts, first, last):
+    return pd.DataFrame({
+        'meter_id': meter_ids, 'check': check, 'phase': phase, 'intervals': counts,
+        'first': first, 'last': last, 'reason': CHECKS[check],
+    })
+
+
+def _mask_flags(check, frame, mask, by_phase=True):
+    # One row per (meter, phase) with at least one interval in mask
+    keys = ['meter_id', 'phase'] if by_phase else ['meter_id']
+    grouped = frame.loc[mask].groupby(keys, sort=False)['timestamp'].agg(['size', 'min', 'max']).reset_index()
+    phase = grouped['phase'] if by_phase else ''
+    return _flags(check, grouped['meter_id'], phase, grouped['size'], grouped['min'], grouped['max'])
+
+
+def _run_flags(check, frame, order, equal, min_run):
+    # equal[k] says row order[k + 1] repeats row order[k]; runs of min_run
+    # equal pairs are found from mask edges, the same way as unbalance runs
+    runs = unbalance_excursions(equal.astype(np.float64), 0.5, min_run)
+    if not len(runs['start']):
+        return _flags(check, [], [], [], [], [])
+    start = order[runs['start']]
+    stop = order[runs['stop']]
+    run_frame = pd.DataFrame({
+        'meter_id': frame['meter_id'].to_numpy()[start], 'phase': frame['phase'].to_numpy()[start],
+        'intervals': runs['intervals'] + 1,
+        'first': frame['timestamp'].to_numpy()[start], 'last': frame['timestamp'].to_numpy()[stop],
+    })
+    grouped = run_frame.groupby(['meter_id', 'phase'], sort=False).agg(
+        intervals=('intervals', 'sum'), first=('first', 'min'), last=('last', 'max')).reset_index()
+    return _flags(check, grouped['meter_id'], grouped['phase'], grouped['intervals'], grouped['first'],
+                  grouped['last'])
+
+
+def screen_frame(frame, interval_minutes=15, export_meters=(), stuck_intervals=STUCK_INTERVALS):
+    # frame: load-profile rows (meter_id, timestamp, phase, voltage, current, angle_deg)
+    valid, rejected = validate_chunk(frame)
+    valid = valid.reset_index(drop=True)
+    minutes = valid['timestamp'].to_numpy().astype('datetime64[m]')
+    valid['timestamp'] = minutes
+    V = valid['voltage'].to_numpy()
+    I = valid['current'].to_numpy()
+    angle = valid['angle_deg'].to_numpy()
+    loaded = I > MIN_CURRENT
+    found = []
+
+    # --- Per-reading checks ---
+    import_only = ~valid['meter_id'].isin(set(export_meters)).to_numpy()
+    reverse = import_only & loaded & (np.abs(angle) > 90)
+    found.append(_mask_flags('reverse_power', valid, reverse))
+    found.append(_mask_flags('missing_potential', valid, loaded & (V < MISSING_POTENTIAL_V)))
+
+    # --- Per (meter, phase) series checks, on rows sorted by time ---
+    meter_code = pd.factorize(valid['meter_id'])[0]
+    phase_code = valid['phase'].map({p: k for k, p in enumerate(PHASES)}).to_numpy()
+    ts = minutes.astype(np.int64)
+    order = np.lexsort((ts, phase_code, meter_code))
+    same_series = ((meter_code[order][1:] == meter_code[order][:-1])
+                   & (phase_code[order][1:] == phase_code[order][:-1]))
+    step = np.diff(ts[order])
+    found.append(_mask_flags('duplicate_timestamp', valid, order[1:][same_series & (step == 0)]))
+    gap = same_series & (step > interval_minutes)
+    if gap.any():
+        missing = pd.DataFrame({
+            'meter_id': valid['meter_id'].to_numpy()[order[1:][gap]],
+            'phase': valid['phase'].to_numpy()[order[1:][gap]],
+            'missing': step[gap] // int(interval_minutes) - 1,
+            'first': valid['timestamp'].to_numpy()[order[:-1][gap]],
+            'last': valid['timestamp'].to_numpy()[order[1:][gap]],
+        }).groupby(['meter_id', 'phase'], sort=False).agg(
+            missing=('missing', 'sum'), first=('first', 'min'), last=('last', 'max')).reset_index()
+        found.append(_flags('timestamp_gap', missing['meter_id'], missing['phase'], missing['missing'],
+                            missing['first'], missing['last']))
+    for check, values in (('stuck_voltage', V), ('stuck_current', I)):
+        sorted_values = values[order]
+        equal = same_series & (step > 0) & (sorted_values[1:] == sorted_values[:-1]) & (sorted_values[1:] > 0)
+        found.append(_run_flags(check, valid, order, equal, stuck_intervals - 1))
+
+    # --- Three-phase checks, on intervals with exactly one R, Y and B row ---
+    order = np.lexsort((phase_code, ts, meter_code))
+    first = np.concatenate([[True], (meter_code[order][1:] != meter_code[order][:-1])
+                            | (ts[order][1:] != ts[order][:-1])])
+    starts = np.flatnonzero(first)
+    sizes = np.diff(np.append(starts, len(order)))
+    starts = starts[sizes == 3]
+    rows = order[starts[:, None] + np.arange(3)]
+    complete = (phase_code[rows] == np.arange(3)).all(axis=1)
+    rows = rows[complete]
+    if len(rows):
+        _, I_phasors = three_phase_phasors(V[rows], I[rows], angle[rows])
+        factor = unbalance_factors(I_phasors)['negative_factor']
+        swapped = (factor > SEQUENCE_FACTOR) & loaded[rows].all(axis=1)
+        # A meter's first interval never continues a run, so runs stay within one meter
+        meter_of = meter_code[rows[:, 0]]
+        swapped[np.flatnonzero(np.diff(meter_of)) + 1] = False
+        runs = unbalance_excursions(swapped.astype(np.float64), 0.5, SEQUENCE_INTERVALS)
+        edges = np.zeros(len(swapped) + 1, dtype=np.int64)
+        np.add.at(edges, runs['start'], 1)
+        np.add.at(edges, runs['stop'], -1)
+        mask = np.zeros(len(valid), dtype=bool)
+        mask[rows[np.cumsum(edges[:-1]) > 0, 0]] = True
+        found.append(_mask_flags('phase_sequence', valid, mask, by_phase=False))
+
+    flags = pd.concat([f for f in found if len(f)], ignore_index=True) if any(len(f) for f in found) else \
+        pd.DataFrame(columns=FLAG_COLUMNS)
+    return flags[FLAG_COLUMNS], len(valid), rejected
+
+
+def screen_file(path, interval_minutes=15, export_meters=(), stuck_intervals=STUCK_INTERVALS):
+    # A meter's file is screened whole, so series checks see every interval
+    frame = pd.concat(read_load_profile(path), ignore_index=True)
+    started = time.perf_counter()
+    flags, rows, rejected = screen_frame(frame, interval_minutes, export_meters, stuck_intervals)
+    return path, flags, rows, rejected, time.perf_counter() - started
+
+
+def meter_summary(flags):
+    # One line per flagged meter, listing every check it failed
+    if not len(flags):
+        return pd.DataFrame(columns=['meter_id', 'checks', 'intervals'])
+    return flags.groupby('meter_id', as_index=False).agg(
+        checks=('check', lambda c: ', '.join(sorted(set(c)))), intervals=('intervals', 'sum'))
+
+
+def screen_fleet(paths, interval_minutes=15, export_meters=(), workers=None, progress=print):
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    if workers == 1:
+        results = (screen_file(p, interval_minutes, export_meters) for p in paths)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        futures = [pool.submit(screen_file, p, interval_minutes, export_meters) for p in paths]
+        results = (f.result() for f in as_completed(futures))
+    found, total_rows = [], 0
+    try:
+        for done, (path, flags, rows, rejected, _) in enumerate(results, 1):
+            found.append(flags)
+            total_rows += rows
+            if progress:
+                rate = total_rows / (time.perf_counter() - started)
+                progress(f"[{done}/{len(paths)}] {os.path.basename(path)}: {len(flags)} flags, {rows} rows "
+                         f"({rejected} rejected), {rate:,.0f} rows/s overall")
+    finally:
+        if workers != 1:
+            pool.shutdown()
+    flags = pd.concat([f for f in found if len(f)], ignore_index=True) if any(len(f) for f in found) else \
+        pd.DataFrame(columns=FLAG_COLUMNS)
+    return flags.sort_values(['meter_id', 'check', 'phase'], kind='stable').reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flag meters with suspect or tampered load-profile readings")
+    parser.add_argument('inputs', nargs='+', help="meter CSV files or directories holding them")
+    parser.add_argument('--interval', type=float, default=15, help="interval length in minutes")
+    parser.add_argument('--export-meters', default='', help="comma-separated meters allowed to export")
+    parser.add_argument('--workers', type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument('--output', default='screening_flags.csv')
+    args = parser.parse_args(argv)
+
+    paths = []
+    for item in args.inputs:
+        if os.path.isdir(item):
+            paths += glob.glob(os.path.join(item, '*.csv')) + glob.glob(os.path.join(item, '*.csv.gz'))
+        else:
+            paths.append(item)
+
+    export_meters = [m for m in args.export_meters.split(',') if m]
+    flags = screen_fleet(sorted(paths), args.interval, export_meters, args.workers)
+    flags.to_csv(args.output, index=False)
+    summary = meter_summary(flags)
+    print(summary.to_string(index=False) if len(summary) else "no meters flagged")
+    print(f"{len(summary)} meters flagged -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import numpy as np
+
+# --- Symmetrical components and unbalance over three-phase time series ---
+
+# Voltage phasor positions used by app333.py for R, Y, B
+VOLTAGE_ANGLES_DEG = np.array([0.0, -120.0, 120.0])
+
+_a = np.exp(2j * np.pi / 3)
+# Rows give zero, positive and negative sequence from [R, Y, B] phasors
+FORTESCUE_INV = np.array([
+    [1, 1, 1],
+    [1, _a, _a ** 2],
+    [1, _a ** 2, _a],
+]) / 3
+
+
+def polar_phasors(magnitude, angle_deg):
+    return np.asarray(magnitude) * np.exp(1j * np.radians(angle_deg))
+
+
+def three_phase_phasors(Vrms, Irms, current_angles_deg, voltage_angles_deg=VOLTAGE_ANGLES_DEG):
+    # Same placement as app333: each current lags its voltage by its angle
+    Vrms = np.asarray(Vrms, dtype=np.float64)
+    voltage_angles_deg = np.broadcast_to(voltage_angles_deg, Vrms.shape)
+    V = polar_phasors(Vrms, voltage_angles_deg)
+    I = polar_phasors(Irms, voltage_angles_deg - np.asarray(current_angles_deg, dtype=np.float64))
+    return V, I
+
+
+def symmetrical_components(phasors):
+    # (N, 3) phase phasors -> (N, 3) [zero, positive, negative] in one matmul
+    return np.asarray(phasors) @ FORTESCUE_INV.T
+
+
+def unbalance_factors(phasors):
+    seq = symmetrical_components(phasors)
+    zero, positive, negative = np.abs(seq[..., 0]), np.abs(seq[..., 1]), np.abs(seq[..., 2])
+    nonzero = positive > 0
+    return {
+        'zero': seq[..., 0],
+        'positive': seq[..., 1],
+        'negative': seq[..., 2],
+        # Negative/positive ratio (VUF, or CUF for currents) and zero/positive
+        'negative_factor': np.divide(negative, positive, out=np.zeros_like(positive), where=nonzero),
+        'zero_factor': np.divide(zero, positive, out=np.zeros_like(positive), where=nonzero),
+    }
+
+
+def sequence_timeseries(V, I):
+    voltage = unbalance_factors(V)
+    current = unbalance_factors(I)
+    result = {f'V_{name}': value for name, value in voltage.items()}
+    result.update({f'I_{name}': value for name, value in current.items()})
+    return result
+
+
+def unbalance_excursions(factor, threshold, min_intervals=1):
+    # Runs of consecutive intervals with factor above threshold, found from
+    # the edges of the boolean mask rather than by walking the series.
+    factor = np.asarray(factor, dtype=np.float64)
+    above = factor > threshold
+    edges = np.diff(np.concatenate([[0], above.view(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    if len(starts):
+        # Values outside a run are -inf, so each segment's max is its run's peak
+        peaks = np.maximum.reduceat(np.where(above, factor, -np.inf), starts)
+    else:
+        peaks = np.empty(0)
+    keep = (stops - starts) >= min_intervals
+    return {'start': starts[keep], 'stop': stops[keep], 'intervals': (stops - starts)[keep], 'peak': peaks[keep]}
+
+
+def excursion_summary(factor, threshold, min_intervals=1):
+    factor = np.asarray(factor)
+    runs = unbalance_excursions(factor, threshold, min_intervals)
+    return {
+        'excursions': len(runs['start']),
+        'intervals_above': int(runs['intervals'].sum()),
+        'fraction_above': float(runs['intervals'].sum() / len(factor)) if len(factor) else 0.0,
+        'longest': int(runs['intervals'].max()) if len(runs['start']) else 0,
+        'peak': float(factor.max()) if len(factor) else 0.0,
+        'p95': float(np.percentile(factor, 95)) if len(factor) else 0.0,
+    }
@@ -0,0 +1,188 @@
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# --- Bounded caches shared by every session in this server process ---
+#
+# Streamlit runs each session's script on its own thread, so anything kept
+# here is seen by all users of the server at once. Only immutable resources
+# and results of pure functions belong here; numpy arrays are returned
+# read-only and DataFrames as copies, so one session cannot change another's
+# result.
+
+# ANALYZER_SHARED_CACHE=0 turns every shared cache into a pass-through,
+# e.g. to measure what the caching buys under load
+ENABLED_ENV = 'ANALYZER_SHARED_CACHE'
+enabled = os.environ.get(ENABLED_ENV, '1') != '0'
+
+# Every cache by name; app scripts re-run on each interaction, so caches
+# are looked up here rather than created again by the script
+caches = {}
+_registry_lock = threading.Lock()
+
+
+def make_key(value, ndigits=None):
+    # Floats are keyed exactly; pass ndigits to round them first, for keys
+    # where nearby inputs may share one entry
+    if isinstance(value, (float, np.floating)):
+        return float(value) if ndigits is None else round(float(value), ndigits)
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return ('ndarray', value.shape, tuple(make_key(v, ndigits) for v in value.ravel().tolist()))
+        return ('ndarray', value.shape, value.dtype.str, hashlib.sha1(np.ascontiguousarray(value)).hexdigest())
+    if _is_pandas(value):
+        import pandas as pd
+
+        hashed = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        columns = tuple(value.columns) if hasattr(value, 'columns') else value.name
+        return (type(value).__name__, columns, tuple(str(d) for d in np.atleast_1d(value.dtypes)),
+                hashlib.sha1(hashed).hexdigest())
+    if isinstance(value, dict):
+        return tuple(sorted((k, make_key(v, ndigits)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(make_key(v, ndigits) for v in value)
+    return value
+
+
+class SharedCache:
+    # LRU bounded by entry count and, given sizeof, by total size.
+    # get_or_compute() runs compute once per key even when several sessions
+    # miss at the same moment: the rest wait for the first one's value.
+
+    def __init__(self, name, max_entries=256, max_bytes=None, sizeof=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        if not enabled:
+            return
+        size = self.sizeof(value) if self.sizeof else 0
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self._bytes -= self._sizes.pop(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+
+    def get_or_compute(self, key, compute):
+        if not enabled:
+            with self._lock:
+                self.misses += 1
+            return compute()
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return self._entries[key]
+                event = self._pending.get(key)
+                if event is None:
+                    event = self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+                self.waits += 1
+            # Another session is computing this key; if it fails, try again here
+            event.wait()
+        try:
+            value = compute()
+            self.put(key, value)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            event.set()
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+
+def shared_cache(name, max_entries=256, max_bytes=None, sizeof=None):
+    # The cache registered under name, created on first use
+    with _registry_lock:
+        cache = caches.get(name)
+        if cache is None:
+            cache = caches[name] = SharedCache(name, max_entries, max_bytes, sizeof)
+        return cache
+
+
+def _is_pandas(value):
+    # Checked by module so pandas is never imported just to build a key
+    return type(value).__module__.split('.')[0] == 'pandas' and hasattr(value, 'dtypes')
+
+
+def freeze(value):
+    # Read-only numpy arrays, also inside dicts, lists and tuples
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for v in value.values():
+            freeze(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            freeze(v)
+    return value
+
+
+def hand_out(value):
+    # What a caller gets from a memo: DataFrames and Series cannot be made
+    # read-only, so each caller gets its own copy; containers are rebuilt
+    # around them and everything else is shared as is
+    if _is_pandas(value):
+        return value.copy()
+    if isinstance(value, dict):
+        return {k: hand_out(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [hand_out(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(hand_out(v) for v in value)
+    return value
+
+
+def memoize(name, max_entries=256, ndigits=None):
+    # Process-wide memo for a pure function, keyed on its arguments.
+    # Arrays in the result are read-only; DataFrames are copied per call.
+    def decorate(func):
+        cache = shared_cache(name, max_entries)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key((args, kwargs), ndigits)
+            return hand_out(cache.get_or_compute(key, lambda: freeze(func(*args, **kwargs))))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorate
@@ -0,0 +1,195 @@
+import time
+
+import numpy as np
+
+from quadrants import QUADRANT_LABELS, classify_quadrant_pq
+
+# --- What-if sweeps: many V/I/angle/frequency/harmonic scenarios at once ---
+#
+# Scenarios are a dict of equal-length arrays: V, I, angle_deg, frequency and
+# optional harmonic fractions of the fundamental, I_h3, I_h5, ... and V_h3,
+# V_h5, ... Waveforms for a whole chunk of scenarios are synthesized as one
+# (scenarios, samples) array, the same formulas as plot_waveforms in
+# app333.py (current lagging its voltage by angle_deg), then reduced to
+# power/energy/quadrant per scenario.
+#
+# Each waveform is sampled over one normalized cycle, and RMS, P and Q over
+# whole cycles do not depend on the frequency. A frequency axis is carried
+# through to the results as a label only: run_sweep computes each distinct
+# set of the other inputs once and copies it to every frequency.
+
+SCENARIO_DEFAULTS = {'V': 230.0, 'I': 10.0, 'angle_deg': 0.0}
+SUMMARY_FIELDS = ['Vrms', 'Irms', 'kW', 'kVAR', 'kVA', 'kVAD', 'PF', 'THD_V', 'THD_I', 'kWh', 'kVARh', 'kVAh']
+
+
+def grid(**axes):
+    # Every combination of the given values, e.g. grid(V=[220, 230], I=('linspace', 0, 100, 11))
+    names = list(axes)
+    values = [np.linspace(*axes[n][1:]) if isinstance(axes[n], tuple) and axes[n][:1] == ('linspace',)
+              else np.atleast_1d(np.asarray(axes[n], dtype=np.float64)) for n in names]
+    mesh = np.meshgrid(*values, indexing='ij')
+    return {name: values.ravel() for name, values in zip(names, mesh)}
+
+
+def monte_carlo(n, seed=0, **params):
+    # Each parameter is a fixed number, ('normal', mean, std),
+    # ('uniform', low, high) or ('choice', [values...])
+    rng = np.random.default_rng(seed)
+    scenarios = {}
+    for name, spec in params.items():
+        if np.isscalar(spec):
+            scenarios[name] = np.full(n, float(spec))
+        elif spec[0] == 'normal':
+            scenarios[name] = rng.normal(spec[1], spec[2], n)
+        elif spec[0] == 'uniform':
+            scenarios[name] = rng.uniform(spec[1], spec[2], n)
+        elif spec[0] == 'choice':
+            scenarios[name] = rng.choice(np.asarray(spec[1], dtype=np.float64), n)
+        else:
+            raise ValueError(f"unknown distribution {spec[0]!r} for {name}")
+    return scenarios
+
+
+def harmonic_orders(scenarios, prefix):
+    return sorted(int(name[len(prefix):]) for name in scenarios if name.startswith(prefix))
+
+
+def _complete(scenarios):
+    n = max((len(np.atleast_1d(v)) for v in scenarios.values()), default=0)
+    full = {name: np.broadcast_to(np.asarray(value, dtype=np.float64), (n,))
+            for name, value in {**SCENARIO_DEFAULTS, **scenarios}.items()}
+    return full, n
+
+
+def _synthesize(phase, rms, shift, harmonics):
+    # rms/shift: (n, 1); harmonics: [(order, (n, 1) fraction)]; phase: (samples,).
+    # rms is the fundamental's; harmonics add on top of it. Each term uses
+    # sin(a - b) = sin a cos b - cos a sin b, so the only sin/cos over the
+    # samples are per order, shared by every scenario in the chunk.
+    peak = np.sqrt(2) * rms
+    wave = (peak * np.cos(shift)) * np.sin(phase) - (peak * np.sin(shift)) * np.cos(phase)
+    for order, fraction in harmonics:
+        amplitude = peak * fraction
+        wave += (amplitude * np.cos(order * shift)) * np.sin(order * phase)
+        wave -= (amplitude * np.sin(order * shift)) * np.cos(order * phase)
+    return wave
+
+
+def run_chunk(scenarios, samples_per_cycle=128, hours=1.0):
+    # Phase axis of one whole cycle; each scenario's time axis is
+    # phase / (2*pi*frequency), so 50 and 60 Hz share the same samples
+    phase = 2 * np.pi * np.arange(samples_per_cycle) / samples_per_cycle
+    V = scenarios['V'][:, None]
+    I = scenarios['I'][:, None]
+    shift = np.radians(scenarios['angle_deg'])[:, None]
+    v_h = [(h, scenarios[f'V_h{h}'][:, None]) for h in harmonic_orders(scenarios, 'V_h')]
+    i_h = [(h, scenarios[f'I_h{h}'][:, None]) for h in harmonic_orders(scenarios, 'I_h')]
+    v = _synthesize(phase, V, np.zeros_like(V), v_h)
+    i = _synthesize(phase, I, shift, i_h)
+
+    N = samples_per_cycle
+    Vrms = np.sqrt(np.einsum('ij,ij->i', v, v) / N)
+    Irms = np.sqrt(np.einsum('ij,ij->i', i, i) / N)
+    P = np.einsum('ij,ij->i', v, i) / N
+    # Fundamental phasors by a one-bin DFT; Q is the fundamental reactive power
+    basis = np.exp(-1j * phase) * np.sqrt(2) / N
+    V1 = v @ basis
+    I1 = i @ basis
+    Q = (V1 * np.conj(I1)).imag
+    S = Vrms * Irms
+    D = np.sqrt(np.maximum(S ** 2 - P ** 2 - Q ** 2, 0.0))
+
+    thd_v = np.sqrt(sum(f[:, 0] ** 2 for _, f in v_h)) if v_h else np.zeros(len(V))
+    thd_i = np.sqrt(sum(f[:, 0] ** 2 for _, f in i_h)) if i_h else np.zeros(len(I))
+    return {
+        'Vrms': Vrms, 'Irms': Irms,
+        'kW': P / 1000, 'kVAR': Q / 1000, 'kVA': S / 1000, 'kVAD': D / 1000,
+        'PF': np.divide(P, S, out=np.zeros_like(P), where=S > 0),
+        'THD_V': thd_v, 'THD_I': thd_i,
+        'kWh': P * hours / 1000, 'kVARh': Q * hours / 1000, 'kVAh': S * hours / 1000,
+        'quadrant': classify_quadrant_pq(P, Q),
+    }
+
+
+def chunk_size(n_harmonics, samples_per_cycle, memory_budget):
+    # v, i, their harmonic temporaries and the products: ~6 float64 arrays
+    # of (chunk, samples) live at once, plus one per harmonic term
+    per_scenario = samples_per_cycle * 8 * (6 + n_harmonics)
+    return max(1, int(memory_budget // per_scenario))
+
+
+def run_sweep(scenarios, samples_per_cycle=128, hours=1.0, memory_budget=16 * 1024 * 1024):
+    scenarios, n = _complete(scenarios)
+    orders = harmonic_orders(scenarios, 'V_h') + harmonic_orders(scenarios, 'I_h')
+    if orders and max(orders) >= samples_per_cycle / 2:
+        raise ValueError(f"harmonic order {max(orders)} needs more than {samples_per_cycle} samples per cycle "
+                         f"(it would alias onto a lower order)")
+    step = chunk_size(len(orders), samples_per_cycle, memory_budget)
+    started = time.perf_counter()
+    if n == 0:
+        results = {name: np.empty(0) for name in SUMMARY_FIELDS}
+        results['quadrant'] = np.empty(0, dtype=np.int8)
+    else:
+        results = _run_unique(scenarios, samples_per_cycle, hours, step)
+    results.update({name: np.asarray(values) for name, values in scenarios.items() if name not in results})
+    results['elapsed'] = time.perf_counter() - started
+    results['chunk'] = step
+    return results
+
+
+def _run_unique(scenarios, samples_per_cycle, hours, step):
+    # Frequency does not change the result, so rows that differ only in
+    # frequency are computed once
+    inputs = {name: values for name, values in scenarios.items() if name != 'frequency'}
+    inverse = None
+    if 'frequency' in scenarios:
+        unique, inverse = np.unique(np.column_stack(list(inputs.values())), axis=0, return_inverse=True)
+        inputs = {name: unique[:, k] for k, name in enumerate(inputs)}
+    n = len(next(iter(inputs.values())))
+    results = None
+    for start in range(0, n, step):
+        chunk = {name: values[start:start + step] for name, values in inputs.items()}
+        part = run_chunk(chunk, samples_per_cycle, hours)
+        if results is None:
+            results = {name: np.empty(n, dtype=values.dtype) for name, values in part.items()}
+        for name, values in part.items():
+            results[name][start:start + step] = values
+    if inverse is not None:
+        results = {name: values[inverse.ravel()] for name, values in results.items()}
+    return results
+
+
+def summarize(results, fields=SUMMARY_FIELDS, percentiles=(5, 50, 95)):
+    import pandas as pd
+
+    rows = []
+    for name in fields:
+        values = results[name]
+        if not len(values):
+            rows.append([name] + [np.nan] * (len(percentiles) + 4))
+            continue
+        rows.append([name, values.mean(), values.std(), values.min(), *np.percentile(values, percentiles),
+                     values.max()])
+    columns = ['Metric', 'Mean', 'Std', 'Min'] + [f'P{p}' for p in percentiles] + ['Max']
+    return pd.DataFrame(rows, columns=columns)
+
+
+def quadrant_shares(results):
+    counts = np.bincount(results['quadrant'].astype(np.intp), minlength=len(QUADRANT_LABELS))
+    return {label: count / len(results['quadrant']) for label, count in zip(QUADRANT_LABELS, counts) if count}
+
+
+def plot_distributions(results, fields=('kW', 'kVAR', 'PF', 'kWh'), bins=60):
+    import matplotlib.pyplot as plt  # loaded on the first plot, not at cold start
+
+    fig, axes = plt.subplots(1, len(fields), figsize=(4 * len(fields), 3.5))
+    for ax, name in zip(np.atleast_1d(axes), fields):
+        values = results[name]
+        ax.hist(values, bins=bins, color='steelblue')
+        for p, style in ((5, ':'), (50, '--'), (95, ':')):
+            ax.axvline(np.percentile(values, p), color='black', linestyle=style, linewidth=1)
+        ax.set_title(name)
+        ax.grid(True, alpha=0.3)
+    np.atleast_1d(axes)[0].set_ylabel('Scenarios')
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,46 @@
+import numpy as np
+
+# --- Three-phase vector diagram and energy table shared by app50.py and batch_reports.py ---
+
+PHASES = ['R', 'Y', 'B']
+REPORT_COLUMNS = ['Phase', 'kW', 'kVAR', 'kVA', 'kWh', 'kVARh', 'kVAh']
+
+
+def plot_combined_three_phase_vectors(v_dict, i_dict, angles_dict):
+    import matplotlib.pyplot as plt  # loaded on the first plot, not at cold start
+    fig, ax = plt.subplots()
+    colors = {'R': 'red', 'Y': 'green', 'B': 'blue'}
+
+    for phase in PHASES:
+        angle_rad = np.radians(angles_dict[phase])
+        Vx = v_dict[phase] * np.cos(0)
+        Vy = v_dict[phase] * np.sin(0)
+        Ix = i_dict[phase] * np.cos(angle_rad)
+        Iy = i_dict[phase] * np.sin(angle_rad)
+
+        ax.quiver(0, 0, Vx, Vy, angles='xy', scale_units='xy', scale=1,
+                  color=colors[phase], width=0.01, label=f'{phase} Voltage')
+        ax.quiver(0, 0, Ix, Iy, angles='xy', scale_units='xy', scale=1,
+                  color=colors[phase], alpha=0.5, width=0.005, label=f'{phase} Current')
+
+    max_val = max(max(v_dict.values()), max(i_dict.values())) + 50
+    ax.set_xlim(-max_val, max_val)
+    ax.set_ylim(-max_val, max_val)
+    ax.set_aspect('equal')
+    ax.grid(True)
+    ax.legend()
+    ax.set_title("Three-Phase Voltage and Current Vectors")
+    return fig
+
+
+def energy_report(v_dict, i_dict, angle_dict, hours):
+    import pandas as pd
+
+    from power_calc import calculate_power_energy
+
+    data = []
+    for phase in PHASES:
+        result = calculate_power_energy(v_dict[phase], i_dict[phase], angle_dict[phase], hours)
+        result['Phase'] = phase
+        data.append(result)
+    return pd.DataFrame(data)[REPORT_COLUMNS]
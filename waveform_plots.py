@@ -0,0 +1,40 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from decimate import envelope, envelope_line
+
+# --- Waveform plots drawn from recorded samples (record_reader) ---
+
+PHASE_COLORS = ['red', 'gold', 'blue']
+
+
+def plot_record_waveforms(record, v_names, i_names, t0=None, t1=None, max_points=2000):
+    # Each series is reduced to a min/max envelope of ~max_points points, read
+    # from the memory map in chunks; zooming in (narrower t0..t1) recomputes
+    # the envelope at the finer resolution, down to the raw samples.
+    sl = record.time_slice(t0, t1)
+    n_buckets = max(1, max_points // 2)
+
+    def series(read):
+        lo, hi, k = envelope(read, sl.start, sl.stop, n_buckets)
+        t_bucket = record.start_time + (sl.start + np.arange(len(lo)) * k) / record.sample_rate
+        if k == 1:
+            return t_bucket, lo
+        return envelope_line(t_bucket, lo, hi)
+
+    fig, ax = plt.subplots(3, 1, figsize=(10, 6), sharex=True)
+    for k, (v_name, i_name) in enumerate(zip(v_names, i_names)):
+        color = PHASE_COLORS[k % len(PHASE_COLORS)]
+        v_channel, i_channel = record[v_name], record[i_name]
+        ax[0].plot(*series(lambda a, b: v_channel[a:b]), color=color, label=v_name, linewidth=0.8)
+        ax[1].plot(*series(lambda a, b: i_channel[a:b]), color=color, label=i_name, linewidth=0.8)
+        ax[2].plot(*series(lambda a, b: v_channel[a:b] * i_channel[a:b]), color=color,
+                   label=f'{v_name}·{i_name}', linewidth=0.8)
+    ax[0].set_ylabel('Voltage (V)')
+    ax[0].legend()
+    ax[1].set_ylabel('Current (A)')
+    ax[1].legend()
+    ax[2].set_ylabel('Power (W)')
+    ax[2].set_xlabel('Time (s)')
+    ax[2].legend()
+    return fig
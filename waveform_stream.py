@@ -0,0 +1,148 @@
+import numpy as np
+
+# --- Per-cycle true RMS and power from sampled v(t)/i(t), fed chunk by chunk ---
+
+RESULT_FIELDS = ['Vrms', 'Irms', 'P', 'Q', 'S', 'PF']
+
+
+def samples_per_cycle(sample_rate, frequency):
+    cycle = sample_rate / frequency
+    samples = int(round(cycle))
+    if samples < 4 or abs(cycle - samples) > 1e-6:
+        raise ValueError(f"sample rate {sample_rate} Hz is not a whole number of samples per {frequency} Hz cycle")
+    return samples
+
+
+class BlockSplitter:
+    # Cuts (v, i) chunks of any length into whole blocks of `block` samples,
+    # carrying at most one partial block over to the next chunk.
+
+    def __init__(self, block, n_phases):
+        self.block = block
+        self.n_phases = n_phases
+        self._v_tail = np.empty((block, n_phases))
+        self._i_tail = np.empty((block, n_phases))
+        self._tail_len = 0
+
+    def _as_columns(self, samples):
+        samples = np.asarray(samples)
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        if samples.shape[1] != self.n_phases:
+            raise ValueError(f"expected {self.n_phases} phase column(s), got {samples.shape[1]}")
+        return samples
+
+    def split(self, v, i):
+        # Returns a list of (v, i) pairs shaped (blocks, block, phases)
+        v = self._as_columns(v)
+        i = self._as_columns(i)
+        if v.shape != i.shape:
+            raise ValueError("voltage and current chunks must have the same shape")
+
+        N = self.block
+        parts = []
+        start = 0
+
+        # Complete the block left over from the previous chunk first
+        if self._tail_len:
+            take = min(N - self._tail_len, len(v))
+            self._v_tail[self._tail_len:self._tail_len + take] = v[:take]
+            self._i_tail[self._tail_len:self._tail_len + take] = i[:take]
+            self._tail_len += take
+            start = take
+            if self._tail_len == N:
+                # Copied, since the tail buffer is refilled before the caller uses it
+                parts.append((self._v_tail[None].copy(), self._i_tail[None].copy()))
+                self._tail_len = 0
+
+        # Whole blocks are reshaped in place, a view for contiguous buffers
+        full = (len(v) - start) // N * N
+        if full:
+            shape = (full // N, N, self.n_phases)
+            parts.append((v[start:start + full].reshape(shape), i[start:start + full].reshape(shape)))
+            start += full
+
+        rest = len(v) - start
+        if rest:
+            self._v_tail[:rest] = v[start:]
+            self._i_tail[:rest] = i[start:]
+            self._tail_len = rest
+
+        return parts
+
+
+class StreamingPowerAnalyzer:
+    # Samples are (n,) for the single phase model (App13.py) or (n, 3) for
+    # R/Y/B (app333.py). Only a partial cycle is ever kept between chunks,
+    # so memory does not grow with the length of the capture.
+
+    def __init__(self, sample_rate, frequency=50.0, n_phases=1):
+        self.samples_per_cycle = samples_per_cycle(sample_rate, frequency)
+        self.sample_rate = sample_rate
+        self.frequency = frequency
+        self.n_phases = n_phases
+        self.cycles_done = 0
+
+        # Fundamental-frequency reference for the one-bin DFT used for Q
+        n = np.arange(self.samples_per_cycle)
+        self._ref = np.exp(-2j * np.pi * n / self.samples_per_cycle) * (2 / self.samples_per_cycle)
+
+        self._blocks = BlockSplitter(self.samples_per_cycle, n_phases)
+
+    def _cycles(self, v, i):
+        # v, i are (cycles, samples_per_cycle, phases). Raw int16 samples
+        # would overflow when squared, so every block is float64 from here on.
+        v = v.astype(np.float64, copy=False)
+        i = i.astype(np.float64, copy=False)
+        Vrms = np.sqrt(np.mean(v * v, axis=1))
+        Irms = np.sqrt(np.mean(i * i, axis=1))
+        P = np.mean(v * i, axis=1)
+        S = Vrms * Irms
+        V1 = np.einsum('cnp,n->cp', v, self._ref)
+        I1 = np.einsum('cnp,n->cp', i, self._ref)
+        # Fundamental reactive power, positive when current lags voltage
+        Q = np.imag(V1 * np.conj(I1)) / 2
+        PF = np.divide(P, S, out=np.zeros_like(P), where=S > 0)
+
+        count = len(Vrms)
+        result = {
+            'cycle': np.arange(self.cycles_done, self.cycles_done + count),
+            'Vrms': Vrms, 'Irms': Irms, 'P': P, 'Q': Q, 'S': S, 'PF': PF,
+        }
+        self.cycles_done += count
+        return result
+
+    def feed(self, v, i):
+        parts = [self._cycles(v_cycles, i_cycles) for v_cycles, i_cycles in self._blocks.split(v, i)]
+        return self._merge(parts)
+
+    def _merge(self, parts):
+        if not parts:
+            empty = np.empty((0, self.n_phases))
+            result = {name: empty for name in RESULT_FIELDS}
+            result['cycle'] = np.empty(0, dtype=np.int64)
+        elif len(parts) == 1:
+            result = parts[0]
+        else:
+            result = {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+
+        if self.n_phases == 1:
+            for name in RESULT_FIELDS:
+                result[name] = result[name][:, 0]
+        else:
+            result['P_total'] = result['P'].sum(axis=1)
+            result['Q_total'] = result['Q'].sum(axis=1)
+            result['S_total'] = result['S'].sum(axis=1)
+        return result
+
+    def stream(self, chunks):
+        # chunks yields (v, i) pairs; results come back per chunk
+        for v, i in chunks:
+            yield self.feed(v, i)
+
+
+def analyze_record(record, v_names, i_names, frequency=50.0, t0=None, t1=None, chunk_samples=1 << 20):
+    # Per-cycle results straight from a memory-mapped record (record_reader)
+    analyzer = StreamingPowerAnalyzer(record.sample_rate, frequency, n_phases=len(v_names))
+    for result in analyzer.stream(record.iter_chunks(v_names, i_names, chunk_samples, t0, t1)):
+        yield result